@@ -1,156 +1,204 @@
 # app.py
+#
+# Startup is kept short: heavy modules (pandas, altair, SciPy, PyMuPDF) are
+# imported where they are first needed and the artifacts load on a background
+# thread while the upload widget renders.
+# `python src/startup.py` reports where cold-start time goes.
 
-import streamlit as st
-import pandas as pd
-import fitz  # PyMuPDF
-import docx2txt
-import pickle
-import re
-import altair as alt
+import time
+SCRIPT_START = time.perf_counter()
 
-# -------------------------------
-# 1. Load Model, Vectorizer, Role-Skills
-# -------------------------------
-with open("src/model.pkl", "rb") as f:
-    model = pickle.load(f)
+import streamlit as st
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-with open("src/vectorizer.pkl", "rb") as f:
-    vectorizer = pickle.load(f)
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
-with open("src/role_skills.pkl", "rb") as f:
-    role_skills = pickle.load(f)
+from artifacts import registry as artifacts
+from skill_matcher import KNOWN_WORDS_PATH, SkillMatcher
+from metrics import metrics, maybe_profile
+from result_cache import ResultCache, content_key
+from extraction import MAX_BYTES, ExtractionError, extract
+from screening import clean_text, extract_skills
+from learning_resources import skill_resources, role_leetcode_questions
 
-all_roles = list(role_skills.keys())
+metrics.record_stage("startup_imports", time.perf_counter() - SCRIPT_START)
 
 # -------------------------------
-# 2. Resume Text Extraction
+# 1. Load Role-Skills Artifacts
 # -------------------------------
-def extract_text(file):
-    if file.type == "application/pdf":
-        pdf = fitz.open(stream=file.read(), filetype="pdf")
-        text = ""
-        for page in pdf:
-            text += page.get_text()
-        return text
-    elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return docx2txt.process(file)
-    elif file.type == "text/plain":
-        return file.read().decode("utf-8")
-    else:
-        return ""
+ROLE_SKILLS_PATH = "src/role_skills.pkl"
+
+def _load_artifacts():
+    # role_scoring pulls in scipy.sparse, which stays off the first render
+    from ats import ATSScorer
+    from role_scoring import RoleScorer
+
+    with metrics.stage("startup_artifacts"):
+        artifacts.warm_up(ROLE_SKILLS_PATH, loader=ATSScorer.from_pickle)
+        artifacts.warm_up(ROLE_SKILLS_PATH, loader=SkillMatcher.from_pickles)
+        artifacts.warm_up(ROLE_SKILLS_PATH, loader=RoleScorer.from_pickle)
+
+@st.cache_resource
+def start_artifact_loading():
+    # Runs once per server process; the page renders while this loads
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-loader").submit(_load_artifacts)
+
+artifacts_ready = start_artifact_loading()
+
+def get_artifacts():
+    """Wait for the background load, then fetch through the registry (which reloads files changed on disk)."""
+    from ats import ATSScorer
+    from role_scoring import RoleScorer
+
+    try:
+        if not artifacts_ready.done():
+            with st.spinner("Loading models..."):
+                artifacts_ready.result()
+        artifacts_ready.result()  # re-raises a failed load
+    except Exception:
+        # Drop the cached failure so the next rerun starts a fresh load instead of failing forever
+        start_artifact_loading.clear()
+        raise
+    # Skills come from role_skills only; src/skills.pkl's per-category vocabularies include
+    # common words, so SkillMatcher uses them just to keep real words from being typo-corrected.
+    return (
+        artifacts.get(ROLE_SKILLS_PATH, ATSScorer.from_pickle),
+        artifacts.get(ROLE_SKILLS_PATH, SkillMatcher.from_pickles),
+        artifacts.get(ROLE_SKILLS_PATH, RoleScorer.from_pickle),
+    )
 
 # -------------------------------
-# 3. Clean Text
+# 2. Screening Pipeline (cached by file content)
 # -------------------------------
-def clean_text(text):
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[^a-zA-Z ]", " ", text)
-    text = text.lower()
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+RESULT_CACHE_DB = os.environ.get("RESUME_CACHE_DB")  # optional on-disk tier, e.g. .cache/results.sqlite
+RESULT_CACHE_TTL = float(os.environ.get("RESUME_CACHE_TTL", 0)) or None
 
-# -------------------------------
-# 4. Skill Extraction
-# -------------------------------
-def extract_skills(text):
-    skills_found = []
-    for role, skills in role_skills.items():
-        for skill in skills:
-            if skill.lower() in text:
-                skills_found.append(skill.lower())
-    return list(set(skills_found))
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(max_entries=256, ttl=RESULT_CACHE_TTL, disk_path=RESULT_CACHE_DB)
 
-# -------------------------------
-# 5. Role Prediction Based on Skills
-# -------------------------------
-def predict_role(skills_found):
-    role_match_count = {}
-    for role, skills in role_skills.items():
-        match_count = len(set(skills_found) & set(skills))
-        role_match_count[role] = match_count
+result_cache = get_result_cache()
 
-    # Sort roles by number of matched skills
-    sorted_roles = sorted(role_match_count.items(), key=lambda x: x[1], reverse=True)
-    best_role = sorted_roles[0][0]
-    secondary_roles = [role for role, count in sorted_roles[1:3]]  # top 2 secondary roles
+METRICS_FILE = os.environ.get("RESUME_METRICS_FILE")  # .prom or .json, see src/metrics.py
 
-    # Skills to master for best role
-    best_role_skills_to_master = list(set(role_skills[best_role]) - set(skills_found))
+def screen_resume(data, file_type):
+    with st.spinner("Extracting text from resume..."):
+        with metrics.stage("extract"):
+            # In-process: a process pool forked from the Streamlit server would copy its threads' state
+            # and outlive reruns; page/time budgets in src/extraction.py bound long PDFs instead
+            extracted = extract(data, file_type)
+        with metrics.stage("clean"):
+            cleaned_text = clean_text(extracted.text)
 
-    # Skills to master for secondary roles
-    secondary_roles_suggestions = {}
-    for role in secondary_roles:
-        missing_skills = list(set(role_skills[role]) - set(skills_found))
-        secondary_roles_suggestions[role] = missing_skills
+    with st.spinner("Extracting skills..."):
+        with metrics.stage("skills"):
+            skills_found = extract_skills(cleaned_text, skill_matcher)
 
-    return best_role, best_role_skills_to_master, secondary_roles_suggestions
+    with st.spinner("Predicting best role..."):
+        # One scoring pass feeds both the prediction and the match-percentage chart
+        with metrics.stage("role"):
+            match_counts, match_percents = role_scorer.score(skills_found)
+            best_role, best_role_skills_to_master, secondary_roles_suggestions = role_scorer.predict_role(
+                skills_found, match_counts
+            )
+
+    with metrics.stage("ats"):
+        # Scored on the extracted text: cleaning would strip the characters the rules look for
+        ats = ats_scorer.explain(extracted.text, skills_found)
+
+    if metrics.enabled:
+        metrics.observe("bytes", len(data))
+        metrics.observe("pages", extracted.pages)
+        metrics.observe("chars", len(extracted.text))
+        metrics.observe("tokens", cleaned_text.count(" ") + 1 if cleaned_text else 0)
+        metrics.observe("skills", len(skills_found))
+
+    return {
+        "skills_found": skills_found,
+        "match_percents": match_percents,
+        "best_role": best_role,
+        "best_role_skills_to_master": best_role_skills_to_master,
+        "secondary_roles_suggestions": secondary_roles_suggestions,
+        "ats_score": ats["score"],
+        "ats_rules": ats["rules"],
+        "truncated": extracted.truncated,
+    }
 
 # -------------------------------
-# 6. Streamlit UI
+# 3. Streamlit UI
 # -------------------------------
 st.set_page_config(page_title="Resume Screening App", page_icon="📄", layout="centered")
 st.title("📄 Resume Screening App")
 st.write("Upload a resume to see its predicted role and skill suggestions.")
 
 uploaded_file = st.file_uploader("Upload Resume (PDF, DOCX, TXT)", type=["pdf","docx","txt"])
+metrics.record_stage("startup_render", time.perf_counter() - SCRIPT_START)
 
 if uploaded_file:
-    with st.spinner("Extracting text from resume..."):
-        resume_text = extract_text(uploaded_file)
-        cleaned_text = clean_text(resume_text)
-
-    with st.spinner("Extracting skills..."):
-        skills_found = extract_skills(cleaned_text)
+    # Wait for the loader thread before importing more: two threads importing
+    # overlapping packages at once can deadlock on the import locks
+    ats_scorer, skill_matcher, role_scorer = get_artifacts()
+
+    import pandas as pd
+    import altair as alt
+    from bundle import MANIFEST_PATH
+    if uploaded_file.size > MAX_BYTES:
+        metrics.inc("rejected_too_large")
+        st.error(f"Resume is larger than the {MAX_BYTES // (1024 * 1024)} MB limit.")
+        st.stop()
+    resume_bytes = uploaded_file.getvalue()
+    # Same file + same artifacts (role/skill tables, the known words guarding typo correction,
+    # the classifier bundle) and ATS rules -> same result, so reruns and duplicate uploads skip the pipeline
+    artifact_paths = [p for p in (ROLE_SKILLS_PATH, KNOWN_WORDS_PATH, MANIFEST_PATH) if os.path.exists(p)]
+    cache_key = content_key(
+        resume_bytes, (uploaded_file.type, artifacts.version(*artifact_paths), ats_scorer.rules_version)
+    )
+    result = result_cache.get(cache_key)
+    metrics.inc("result_cache_miss" if result is None else "result_cache_hit")
+    if result is None:
+        try:
+            with maybe_profile("upload"):
+                result = screen_resume(resume_bytes, uploaded_file.type)
+        except ExtractionError as e:
+            st.error(str(e))
+            st.stop()
+        result_cache.put(cache_key, result)
+    render_start = time.perf_counter()
+    if result["truncated"]:
+        st.warning("This resume is very long; only the first pages were analysed.")
+
+    skills_found = result["skills_found"]
+    match_percents = result["match_percents"]
+    best_role = result["best_role"]
+    best_role_skills_to_master = result["best_role_skills_to_master"]
+    secondary_roles_suggestions = result["secondary_roles_suggestions"]
+    ats_score = result["ats_score"]
 
-    with st.spinner("Predicting best role..."):
-        best_role, best_role_skills_to_master, secondary_roles_suggestions = predict_role(skills_found)
-        # -------------------------------
+    # -------------------------------
     # ATS Friendliness Checker (before role prediction)
     # -------------------------------
-    def ats_friendliness_score(text, skills_found):
-        score = 0
-        max_score = 100
-
-        # 1. Presence of relevant skills in resume
-        total_skills = sum(len(skills) for skills in role_skills.values())
-        if total_skills > 0:
-            skill_coverage = len(skills_found) / total_skills
-            score += int(skill_coverage * 50)  # 50 points for skills coverage
-
-        # 2. Resume length check
-        if len(text) < 1000:
-            score += 10  # shorter resumes less preferred
-        else:
-            score += 20
-
-        # 3. Readability: penalize excessive special characters
-        non_alpha_ratio = len(re.findall(r"[^a-zA-Z\s]", text)) / max(len(text), 1)
-        if non_alpha_ratio < 0.05:
-            score += 20
-        elif non_alpha_ratio < 0.1:
-            score += 10
-        else:
-            score += 0
-
-        return min(score, max_score)
-
-    ats_score = ats_friendliness_score(cleaned_text, skills_found)
     st.subheader("📄 ATS Friendliness Score")
     st.progress(ats_score / 100)
     st.write(f"Your resume is **{ats_score}% ATS-friendly**.")
     st.info(
         "A higher score means your resume is more likely to be parsed correctly by Applicant Tracking Systems (ATS)."
     )
+    with st.expander("How the score is made up"):
+        for rule in result["ats_rules"]:
+            st.write(f"**{rule['rule'].replace('_', ' ').capitalize()}**: "
+                     f"{rule['points']} / {rule['max_points']} points ({rule['feature']} = {rule['value']})")
 
 
-    # Compute Role Match Percentages
-    role_match_percent = {}
-    for role, skills in role_skills.items():
-        match_count = len(set(skills_found) & set(skills))
-        role_match_percent[role] = (match_count / len(skills)) * 100  # % match
-
-    df_roles = pd.DataFrame(role_match_percent.items(), columns=['Role', 'Match %'])
-    df_roles = df_roles.sort_values(by='Match %', ascending=False).head(6)
+    # Role Match Percentages: (matched skills / total role skills) * 100
+    top_roles = role_scorer.top_k(match_percents, 6)
+    df_roles = pd.DataFrame({
+        'Role': [role_scorer.roles[i] for i in top_roles],
+        'Match %': match_percents[top_roles],
+    })
 
     # Display bar chart
     st.subheader("📊 Role Match Percentage")
@@ -194,39 +242,6 @@ if uploaded_file:
     # -------------------------------
     # Learning Resources
     st.subheader("📚 Learning Resources for Skills to Master")
-    skill_resources = {
-    "python": "https://www.learnpython.org/",
-    "django": "https://www.djangoproject.com/start/",
-    "flask": "https://flask.palletsprojects.com/en/2.3.x/tutorial/",
-    "aws": "https://aws.amazon.com/training/",
-    "docker": "https://www.docker.com/101-tutorial",
-    "kubernetes": "https://kubernetes.io/docs/tutorials/",
-    "sql": "https://www.w3schools.com/sql/",
-    "excel": "https://www.coursera.org/learn/excel-data-analysis",
-    "javascript": "https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide",
-    "react": "https://reactjs.org/tutorial/tutorial.html",
-    "java": "https://www.learnjavaonline.org/",
-    "spring": "https://spring.io/guides",
-    "selenium": "https://www.selenium.dev/documentation/",
-    # --- New additions ---
-    "cpp": "https://www.learncpp.com/",
-    "exploitation": "https://owasp.org/",  # OWASP: ethical web-security guidance and safe learning resources
-    "firewall": "https://www.pfsense.org/learn/",
-    "api": "https://swagger.io/docs/",
-    "angular": "https://angular.io/tutorial",
-    "css": "https://developer.mozilla.org/en-US/docs/Web/CSS",
-    "html": "https://developer.mozilla.org/en-US/docs/Web/HTML",
-    "linux": "https://linuxjourney.com/",
-    "automation": "https://www.ansible.com/resources/get-started",
-    "bash": "https://linuxcommand.org/",
-    "git": "https://git-scm.com/docs/gittutorial",
-    "nodejs": "https://nodejs.dev/learn",
-    "typescript": "https://www.typescriptlang.org/docs/handbook/intro.html",
-    "graphql": "https://graphql.org/learn/",
-    "rest": "https://restfulapi.net/",
-    "ci_cd": "https://www.jenkins.io/doc/tutorials/",
-    "security": "https://www.mitre.org/"  # MITRE for ATT&CK etc. (defensive/security frameworks)
-}
 
     if best_role_skills_to_master:
         for i in range(0, len(best_role_skills_to_master), 3):
@@ -262,118 +277,6 @@ if uploaded_file:
 # -------------------------------
 # Top LeetCode Questions by Role
 # -------------------------------
-role_leetcode_questions = {
-    "Data Science": {
-        "Two Sum": "https://leetcode.com/problems/two-sum/",
-        "Median of Two Sorted Arrays": "https://leetcode.com/problems/median-of-two-sorted-arrays/",
-        "Kth Largest Element in an Array": "https://leetcode.com/problems/kth-largest-element-in-an-array/"
-    },
-    "HR": {
-        "Valid Parentheses": "https://leetcode.com/problems/valid-parentheses/",
-        "Group Anagrams": "https://leetcode.com/problems/group-anagrams/",
-        "Meeting Rooms II": "https://leetcode.com/problems/meeting-rooms-ii/"
-    },
-    "Arts Teacher": {
-        "Flood Fill": "https://leetcode.com/problems/flood-fill/",
-        "Unique Paths": "https://leetcode.com/problems/unique-paths/",
-        "Generate Parentheses": "https://leetcode.com/problems/generate-parentheses/"
-    },
-    "Web Designer": {
-        "Valid Palindrome": "https://leetcode.com/problems/valid-palindrome/",
-        "Minimum Window Substring": "https://leetcode.com/problems/minimum-window-substring/",
-        "Longest Common Prefix": "https://leetcode.com/problems/longest-common-prefix/"
-    },
-    "Mechanical Engineer": {
-        "Design HashMap": "https://leetcode.com/problems/design-hashmap/",
-        "Rotate Image": "https://leetcode.com/problems/rotate-image/",
-        "Trapping Rain Water": "https://leetcode.com/problems/trapping-rain-water/"
-    },
-    "Sales": {
-        "Best Time to Buy and Sell Stock": "https://leetcode.com/problems/best-time-to-buy-and-sell-stock/",
-        "Task Scheduler": "https://leetcode.com/problems/task-scheduler/",
-        "Top K Frequent Elements": "https://leetcode.com/problems/top-k-frequent-elements/"
-    },
-    "Health and Fitness Trainer": {
-        "Climbing Stairs": "https://leetcode.com/problems/climbing-stairs/",
-        "Maximum Subarray": "https://leetcode.com/problems/maximum-subarray/",
-        "Longest Increasing Subsequence": "https://leetcode.com/problems/longest-increasing-subsequence/"
-    },
-    "Civil Engineer": {
-        "Max Area of Island": "https://leetcode.com/problems/max-area-of-island/",
-        "Walls and Gates": "https://leetcode.com/problems/walls-and-gates/",
-        "Course Schedule": "https://leetcode.com/problems/course-schedule/"
-    },
-    "Java Developer": {
-        "Implement strStr()": "https://leetcode.com/problems/implement-strstr/",
-        "Reverse Integer": "https://leetcode.com/problems/reverse-integer/",
-        "Valid Parentheses": "https://leetcode.com/problems/valid-parentheses/"
-    },
-    "Python Developer": {
-        "Add Two Numbers": "https://leetcode.com/problems/add-two-numbers/",
-        "Valid Anagram": "https://leetcode.com/problems/valid-anagram/",
-        "Word Break": "https://leetcode.com/problems/word-break/"
-    },
-    "Full Stack Developer": {
-        "Design Twitter": "https://leetcode.com/problems/design-twitter/",
-        "LFU Cache": "https://leetcode.com/problems/lfu-cache/",
-        "Serialize and Deserialize Binary Tree": "https://leetcode.com/problems/serialize-and-deserialize-binary-tree/"
-    },
-    "Frontend Developer": {
-        "Design Browser History": "https://leetcode.com/problems/design-browser-history/",
-        "Number of Islands": "https://leetcode.com/problems/number-of-islands/",
-        "Longest Increasing Subsequence": "https://leetcode.com/problems/longest-increasing-subsequence/"
-    },
-    "Database Engineer": {
-        "Database Queries (SQL I)": "https://leetcode.com/studyplan/sql/",
-        "Employees Earning More Than Their Managers": "https://leetcode.com/problems/employees-earning-more-than-their-managers/",
-        "Department Highest Salary": "https://leetcode.com/problems/department-highest-salary/"
-    },
-    "DevOps Engineer": {
-        "Min Stack": "https://leetcode.com/problems/min-stack/",
-        "Evaluate Reverse Polish Notation": "https://leetcode.com/problems/evaluate-reverse-polish-notation/",
-        "Design Circular Queue": "https://leetcode.com/problems/design-circular-queue/"
-    },
-    "Network Security Engineer": {
-        "Network Delay Time": "https://leetcode.com/problems/network-delay-time/",
-        "Evaluate Division": "https://leetcode.com/problems/evaluate-division/",
-        "Redundant Connection": "https://leetcode.com/problems/redundant-connection/"
-    },
-    "Ethical Hacker": {
-        "Keys and Rooms": "https://leetcode.com/problems/keys-and-rooms/",
-        "Word Ladder": "https://leetcode.com/problems/word-ladder/",
-        "Open the Lock": "https://leetcode.com/problems/open-the-lock/"
-    },
-    "Business Analyst": {
-        "Range Sum Query - Immutable": "https://leetcode.com/problems/range-sum-query-immutable/",
-        "Product of Array Except Self": "https://leetcode.com/problems/product-of-array-except-self/",
-        "Pivot Index": "https://leetcode.com/problems/find-pivot-index/"
-    },
-    "Automation Tester": {
-        "Implement Queue using Stacks": "https://leetcode.com/problems/implement-queue-using-stacks/",
-        "String to Integer (atoi)": "https://leetcode.com/problems/string-to-integer-atoi/",
-        "Valid Sudoku": "https://leetcode.com/problems/valid-sudoku/"
-    },
-    "PMO": {
-        "Meeting Rooms II": "https://leetcode.com/problems/meeting-rooms-ii/",
-        "Course Schedule II": "https://leetcode.com/problems/course-schedule-ii/",
-        "Task Scheduler": "https://leetcode.com/problems/task-scheduler/"
-    },
-    "Blockchain Developer": {
-        "Valid Blockchain Transactions (custom-like)": "https://leetcode.com/problems/valid-parentheses/",
-        "Encode and Decode Strings": "https://leetcode.com/problems/encode-and-decode-strings/",
-        "Find Duplicate Subtrees": "https://leetcode.com/problems/find-duplicate-subtrees/"
-    },
-    "ETL Developer": {
-        "Data Stream as Disjoint Intervals": "https://leetcode.com/problems/data-stream-as-disjoint-intervals/",
-        "Intersection of Two Arrays II": "https://leetcode.com/problems/intersection-of-two-arrays-ii/",
-        "Find All Anagrams in a String": "https://leetcode.com/problems/find-all-anagrams-in-a-string/"
-    },
-    "SAP Developer": {
-        "Merge Intervals": "https://leetcode.com/problems/merge-intervals/",
-        "Insert Interval": "https://leetcode.com/problems/insert-interval/",
-        "Minimum Path Sum": "https://leetcode.com/problems/minimum-path-sum/"
-    }
-}
 if uploaded_file and best_role:
     st.subheader(f"💻 Top LeetCode Questions for {best_role}")
 
@@ -390,3 +293,7 @@ if uploaded_file and best_role:
     else:
         st.write("No curated LeetCode questions available for this role yet.")
 
+if uploaded_file:
+    metrics.record_stage("render", time.perf_counter() - render_start)
+    if METRICS_FILE:
+        metrics.dump(METRICS_FILE)
@@ -0,0 +1,61 @@
+# src/artifacts.py
+# Process-wide cache for model artifacts (pickles, vectorizers, lookup tables).
+
+import os
+import pickle
+import threading
+
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ArtifactRegistry:
+    """Lazily loads artifacts and memoizes them by path and file version.
+
+    Each entry is keyed by ``(path, loader)`` and remembers the file's mtime and
+    size. ``get`` does a single ``os.stat`` and only reloads when the file on
+    disk has changed, so retraining hot-reloads without a restart while normal
+    requests never pay for deserialization.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path, loader=load_pickle):
+        path = os.path.abspath(path)
+        key = (path, loader)
+        version = self._version(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                entry = (version, loader(path))
+                self._entries[key] = entry
+        return entry[1]
+
+    def version(self, *paths):
+        """Combined version tag for ``paths``; changes whenever any of the files does."""
+        return tuple(self._version(os.path.abspath(p)) for p in paths)
+
+    def warm_up(self, *paths, loader=load_pickle):
+        """Load ``paths`` ahead of the first request."""
+        for path in paths:
+            self.get(path, loader)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by predict.py, batch.py and app.py
+registry = ArtifactRegistry()
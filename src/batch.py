@@ -0,0 +1,370 @@
+# src/batch.py
+# Headless batch screening.
+#
+#   python src/batch.py resumes/ -o results.jsonl
+#   python src/batch.py data/Resume.csv -o results.parquet --workers 8
+#   python src/batch.py export.parquet -o results.parquet     # Parquet input is read by record batch
+#   python src/batch.py inbox/ -o results.jsonl --dedupe .cache/dedup.sqlite --skip-duplicates
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from artifacts import registry
+from ats import ATSScorer
+from dedup import THRESHOLD, DuplicateIndex
+from extraction import EXTENSION_TYPES, MAX_BYTES, MAX_PAGES, TIMEOUT, extract
+from ingest import iter_batches
+from screening import clean_text, extract_skills
+from role_scoring import RoleScorer
+from skill_matcher import SkillMatcher
+
+ROLE_SKILLS_PATH = "src/role_skills.pkl"
+STAGES = ["extract", "clean", "dedupe", "skills", "role", "ats"]
+
+# -------------------------------
+# 1. Input Sources
+# -------------------------------
+def iter_directory(path):
+    """Yield one work item per PDF/DOCX/TXT file under ``path``."""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            ext = os.path.splitext(name)[1].lower()
+            if ext in EXTENSION_TYPES:
+                file_path = os.path.join(root, name)
+                yield {"id": os.path.relpath(file_path, path), "path": file_path, "type": EXTENSION_TYPES[ext]}
+
+
+def iter_table(path, chunk_size):
+    """Yield one work item per row of a CSV or Parquet file shaped like data/Resume.csv."""
+    row_id = 0
+    for chunk in iter_batches(path, batch_size=chunk_size):
+        categories = chunk["Category"] if "Category" in chunk else itertools.repeat(None)
+        for text, category in zip(chunk["Resume"], categories):
+            yield {"id": str(row_id), "text": text if isinstance(text, str) else "", "category": category}
+            row_id += 1
+
+
+def iter_inputs(path, chunk_size):
+    if os.path.isdir(path):
+        return iter_directory(path)
+    if path.lower().endswith((".csv", ".parquet")):
+        return iter_table(path, chunk_size)
+    raise ValueError(f"Input must be a directory, a .csv or a .parquet file: {path}")
+
+
+def iter_chunks(items, chunk_size):
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+# -------------------------------
+# 2. Worker
+# -------------------------------
+_ats_scorer = None
+_skill_matcher = None
+_role_scorer = None
+_extract_limits = {}
+
+
+def init_worker(role_skills_path, extract_limits=None):
+    global _ats_scorer, _skill_matcher, _role_scorer, _extract_limits
+    _extract_limits = extract_limits or {}
+    _ats_scorer = registry.get(role_skills_path, ATSScorer.from_pickle)
+    _skill_matcher = registry.get(role_skills_path, SkillMatcher.from_pickles)
+    _role_scorer = registry.get(role_skills_path, RoleScorer.from_pickle)
+
+
+def _empty_record(item):
+    return {"id": item["id"], "category": item.get("category"), "truncated": False,
+            "duplicate_of": None, "similarity": None}
+
+
+def prepare_item(item):
+    """Extract and clean one work item; returns ``(record, text, cleaned, timings)``."""
+    record = _empty_record(item)
+    timings = {}
+    try:
+        start = time.perf_counter()
+        if "path" in item:
+            # Extract from the path so PyMuPDF reads the file itself instead of a Python copy
+            extracted = extract(item["path"], item["type"], **_extract_limits)
+            text = extracted.text
+            record["truncated"] = extracted.truncated
+        else:
+            text = item["text"]
+        timings["extract"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cleaned = clean_text(text)
+        timings["clean"] = time.perf_counter() - start
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record, None, None, timings
+    return record, text, cleaned, timings
+
+
+def score_prepared(batch):
+    """Score a list of ``prepare_item`` outputs; returns ``[(record, timings), ...]``.
+
+    Skills are found per resume. Role match counts for the whole batch come
+    from one sparse product (see role_scoring.RoleScorer.score_many) and the
+    ATS rules run once over the batch (see ats.ATSScorer.score_batch); the
+    time of each batched step is split evenly.
+    """
+    results, matched = [], []
+    for record, text, cleaned, timings in batch:
+        results.append((record, timings))
+        if cleaned is None:
+            continue
+        try:
+            start = time.perf_counter()
+            skills_found = extract_skills(cleaned, _skill_matcher)
+            timings["skills"] = time.perf_counter() - start
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            continue
+        matched.append((record, text, skills_found, timings))
+    if not matched:
+        return results
+
+    start = time.perf_counter()
+    counts = _role_scorer.score_many([skills_found for _, _, skills_found, _ in matched])
+    seconds = (time.perf_counter() - start) / len(matched)
+    scored = []
+    for i, (record, text, skills_found, timings) in enumerate(matched):
+        try:
+            start = time.perf_counter()
+            best_role, skills_to_master, secondary = _role_scorer.predict_role(skills_found, counts[i])
+            timings["role"] = seconds + time.perf_counter() - start
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            continue
+        record.update({
+            "best_role": best_role,
+            "skills": skills_found,
+            "skills_to_master": skills_to_master,
+            "secondary_roles": [{"role": r, "missing_skills": m} for r, m in secondary.items()],
+            "error": None,
+        })
+        scored.append((record, text, timings))
+
+    if scored:
+        start = time.perf_counter()
+        scores, points = _ats_scorer.score_batch([text for _, text, _ in scored],
+                                                 [record["skills"] for record, _, _ in scored])
+        seconds = (time.perf_counter() - start) / len(scored)
+        for i, (record, _, timings) in enumerate(scored):
+            record["ats_score"] = int(scores[i])
+            record["ats_rules"] = {name: int(p[i]) for name, p in points.items()}
+            timings["ats"] = seconds
+    return results
+
+
+def screen_items(items):
+    """Run the full pipeline on a list of work items; returns ``[(record, timings), ...]``."""
+    return score_prepared([prepare_item(item) for item in items])
+
+# -------------------------------
+# 3. Output Writers
+# -------------------------------
+class JsonlWriter:
+    def __init__(self, path):
+        self.f = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        for record in records:
+            self.f.write(json.dumps(record) + "\n")
+
+    def close(self):
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        strings = pa.list_(pa.string())
+        self.schema = pa.schema([
+            ("id", pa.string()),
+            ("category", pa.string()),
+            ("best_role", pa.string()),
+            ("skills", strings),
+            ("skills_to_master", strings),
+            ("secondary_roles", pa.list_(pa.struct([("role", pa.string()), ("missing_skills", strings)]))),
+            ("ats_score", pa.int32()),
+            ("ats_rules", pa.map_(pa.string(), pa.int32())),
+            ("truncated", pa.bool_()),
+            ("duplicate_of", pa.string()),
+            ("similarity", pa.float64()),
+            ("error", pa.string()),
+        ])
+        self._pa = pa
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, records):
+        if records:
+            self.writer.write_table(self._pa.Table.from_pylist(records, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path, fmt):
+    if fmt is None:
+        fmt = "parquet" if path.endswith(".parquet") else "jsonl"
+    return ParquetWriter(path) if fmt == "parquet" else JsonlWriter(path)
+
+# -------------------------------
+# 4. Driver
+# -------------------------------
+def check_duplicates(prepared, dedupe_index, skip_duplicates, source=""):
+    """Flag near-duplicates of earlier resumes in the main process, in input order.
+
+    Resumes are stored as ``<source>:<id>`` (the input's file name and the row
+    number or relative path), so ``duplicate_of`` says which input an earlier
+    copy came from. With ``skip_duplicates`` a flagged resume is not scored:
+    its cleaned text is dropped so ``score_prepared`` returns the record as is.
+    """
+    checked, skipped = [], 0
+    for record, text, cleaned, timings in prepared:
+        if cleaned is not None:
+            start = time.perf_counter()
+            duplicate_of, score = dedupe_index.check(f"{source}:{record['id']}", cleaned)
+            timings["dedupe"] = time.perf_counter() - start
+            if duplicate_of is not None:
+                record["duplicate_of"], record["similarity"] = duplicate_of, round(score, 4)
+                if skip_duplicates:
+                    record["error"] = None
+                    cleaned = None
+                    skipped += 1
+        checked.append((record, text, cleaned, timings))
+    dedupe_index.commit()
+    return checked, skipped
+
+
+def run_batch(input_path, output_path, fmt=None, workers=None, chunk_size=256,
+              role_skills_path=ROLE_SKILLS_PATH, extract_limits=None,
+              dedupe_path=None, dedupe_threshold=THRESHOLD, skip_duplicates=False):
+    """Screen every resume in ``input_path`` and stream results to ``output_path``.
+
+    Work is read and dispatched one chunk at a time, so memory stays bounded by
+    ``chunk_size`` regardless of the input size. With ``dedupe_path`` every
+    resume is checked against a persistent MinHash store between cleaning and
+    scoring (see dedup.py). Returns a throughput summary.
+    """
+    workers = workers or os.cpu_count() or 1
+    stage_totals = dict.fromkeys(STAGES, 0.0)
+    format_totals = {}
+    processed = errors = duplicates = skipped = 0
+    writer = open_writer(output_path, fmt)
+    dedupe_index = DuplicateIndex(dedupe_path, threshold=dedupe_threshold, autocommit=False) if dedupe_path else None
+    pool = None
+    start = time.perf_counter()
+    try:
+        # Work is handed out in small batches; each is scored with one vectorized ATS pass
+        task_size = max(1, chunk_size // (workers * 4))
+        if workers > 1:
+            pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(role_skills_path, extract_limits))
+        else:
+            init_worker(role_skills_path, extract_limits)
+        imap = pool.imap if pool is not None else map
+
+        for chunk in iter_chunks(iter_inputs(input_path, chunk_size), chunk_size):
+            if dedupe_index is None:
+                batches = imap(screen_items, iter_chunks(chunk, task_size))
+            else:
+                # Two passes so duplicates are caught before the scoring stages run
+                prepared = pool.imap(prepare_item, chunk, task_size) if pool is not None else map(prepare_item, chunk)
+                prepared, chunk_skipped = check_duplicates(prepared, dedupe_index, skip_duplicates,
+                                                           os.path.basename(os.path.normpath(input_path)))
+                skipped += chunk_skipped
+                batches = imap(score_prepared, iter_chunks(prepared, task_size))
+            results = itertools.chain.from_iterable(batches)
+            records = []
+            for item, (record, timings) in zip(chunk, results):
+                records.append(record)
+                for stage, seconds in timings.items():
+                    stage_totals[stage] += seconds
+                fmt_entry = format_totals.setdefault(item.get("type", "csv"), [0, 0.0])
+                fmt_entry[0] += 1
+                fmt_entry[1] += timings.get("extract", 0.0)
+                errors += record["error"] is not None
+                duplicates += record["duplicate_of"] is not None
+            writer.write(records)
+            processed += len(records)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        writer.close()
+        if dedupe_index is not None:
+            dedupe_index.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "resumes": processed,
+        "errors": errors,
+        "duplicates": duplicates,
+        "duplicates_skipped": skipped,
+        "workers": workers,
+        "elapsed_sec": round(elapsed, 3),
+        "resumes_per_sec": round(processed / elapsed, 2) if elapsed > 0 else None,
+        # Stage times are summed across workers (CPU seconds, not wall time)
+        "stage_sec": {stage: round(total, 3) for stage, total in stage_totals.items()},
+        "stage_ms_per_resume": {
+            stage: round(1000 * total / processed, 3) if processed else None
+            for stage, total in stage_totals.items()
+        },
+        "extract_ms_by_format": {
+            file_type: round(1000 * seconds / count, 3) for file_type, (count, seconds) in format_totals.items()
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a folder or CSV of resumes in batch.")
+    parser.add_argument("input", help="Directory of PDF/DOCX/TXT resumes, or a CSV/Parquet file with a 'Resume' column")
+    parser.add_argument("-o", "--output", default="-", help="Output file (.jsonl or .parquet); '-' for stdout")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="Output format (default: from extension)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Resumes read and dispatched per chunk")
+    parser.add_argument("--role-skills", default=ROLE_SKILLS_PATH, help="Pickled role -> skills dictionary")
+    parser.add_argument("--max-mb", type=float, default=MAX_BYTES / (1024 * 1024), help="Skip files larger than this")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES, help="Read at most this many PDF pages")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Per-file extraction time budget (seconds)")
+    parser.add_argument("--dedupe", metavar="STORE",
+                        help="Flag near-duplicates against this SQLite signature store (created if missing)")
+    parser.add_argument("--dedupe-threshold", type=float, default=THRESHOLD,
+                        help="Minimum estimated Jaccard similarity to count as a duplicate")
+    parser.add_argument("--skip-duplicates", action="store_true", help="Don't score resumes flagged by --dedupe")
+    args = parser.parse_args(argv)
+
+    if args.skip_duplicates and not args.dedupe:
+        parser.error("--skip-duplicates needs --dedupe")
+    if args.output == "-" and args.format == "parquet":
+        parser.error("Parquet output needs a file path")
+
+    extract_limits = {
+        "max_bytes": int(args.max_mb * 1024 * 1024),
+        "max_pages": args.max_pages,
+        "timeout": args.timeout,
+    }
+    summary = run_batch(args.input, args.output, args.format, args.workers, args.chunk_size,
+                        args.role_skills, extract_limits, args.dedupe, args.dedupe_threshold,
+                        args.skip_duplicates)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
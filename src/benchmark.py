@@ -0,0 +1,293 @@
+# src/benchmark.py
+# Reference benchmarks for the screening pipeline.
+#
+#   python src/benchmark.py -o bench.json                      # measure
+#   python src/benchmark.py -o new.json --baseline bench.json  # measure and compare
+#   python src/benchmark.py --quick                            # fewer repeats, small fixtures only
+#
+# Exits with status 1 when any stage's median latency regresses by more than
+# --threshold compared to the baseline. Slowdowns smaller than --min-delta-ms
+# are ignored: sub-millisecond stages swing by more than 10% from run to run.
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from artifacts import registry
+from ats import ATSScorer
+from extraction import DOCX_TYPE, PDF_TYPE, TXT_TYPE, extract
+from predict import predict_batch, warm_up
+from role_scoring import RoleScorer
+from screening import clean_text, extract_skills
+from skill_matcher import SkillMatcher
+
+DATA_PATH = "data/Resume.csv"
+ROLE_SKILLS_PATH = "src/role_skills.pkl"
+FIXTURE_DIR = ".cache/bench_fixtures"
+CHARS_PER_PAGE = 3000
+SIZES = {"small": 1, "medium": 5, "large": 30}  # approximate pages
+MIN_DELTA_MS = 0.05
+FORMATS = {"txt": TXT_TYPE, "docx": DOCX_TYPE, "pdf": PDF_TYPE}
+
+# -------------------------------
+# 1. Fixtures
+# -------------------------------
+def synthetic_resume(role_skills, n_chars, seed=0):
+    rng = random.Random(seed)
+    skills = [s for skill_list in role_skills.values() for s in skill_list]
+    filler = ("experience project team delivered managed designed implemented responsible "
+              "client requirements analysis development support university bachelor").split()
+    words, length = [], 0
+    while length < n_chars:
+        word = rng.choice(skills) if rng.random() < 0.15 else rng.choice(filler)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def corpus_resume(texts, n_chars):
+    """Concatenate Resume.csv rows until the text is about ``n_chars`` long."""
+    parts, length = [], 0
+    for text in texts:
+        parts.append(text)
+        length += len(text)
+        if length >= n_chars:
+            break
+    return "\n".join(parts)[:n_chars]
+
+
+def write_txt(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(path, text):
+    paragraphs = "".join(
+        f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(line)}</w:t></w:r></w:p>" for line in text.split("\n")
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-'
+                   'officedocument.wordprocessingml.document.main+xml"/></Types>')
+        z.writestr("_rels/.rels",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                   'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f"<w:body>{paragraphs}</w:body></w:document>")
+
+
+def write_pdf(path, text):
+    import fitz  # PyMuPDF
+
+    with fitz.open() as pdf:
+        for start in range(0, max(len(text), 1), CHARS_PER_PAGE):
+            page = pdf.new_page()
+            page.insert_textbox(page.rect + (50, 50, -50, -50), text[start:start + CHARS_PER_PAGE], fontsize=8)
+        pdf.save(path)
+
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+
+def build_fixtures(role_skills, sizes, fixture_dir=FIXTURE_DIR, data_path=DATA_PATH):
+    """Write synthetic and Resume.csv-derived fixtures; returns ``[(name, path, file_type), ...]``."""
+    os.makedirs(fixture_dir, exist_ok=True)
+    texts = pd.read_csv(data_path)["Resume"].dropna().tolist()
+    fixtures = []
+    for size in sizes:
+        n_chars = SIZES[size] * CHARS_PER_PAGE
+        sources = {
+            "synthetic": synthetic_resume(role_skills, n_chars),
+            "corpus": corpus_resume(texts, n_chars),
+        }
+        for source, text in sources.items():
+            for fmt, file_type in FORMATS.items():
+                name = f"{source}/{size}/{fmt}"
+                path = os.path.join(fixture_dir, f"{source}-{size}.{fmt}")
+                if not os.path.exists(path):
+                    WRITERS[fmt](path, text)
+                fixtures.append((name, path, file_type))
+    return fixtures
+
+# -------------------------------
+# 2. Measurement
+# -------------------------------
+def summarize(samples, items=1):
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    return {
+        "median_ms": round(1000 * median, 4),
+        "p95_ms": round(1000 * samples[min(len(samples) - 1, int(0.95 * len(samples)))], 4),
+        "mean_ms": round(1000 * statistics.fmean(samples), 4),
+        "throughput_per_sec": round(items / median, 2) if median > 0 else None,
+        "repeats": len(samples),
+    }
+
+
+def run_pipeline(path, file_type, skill_matcher, role_scorer, ats_scorer, timings=None):
+    # state: (raw text, cleaned text, skills, ...)
+    stages = [
+        ("extract", lambda _: extract(path, file_type, max_pages=10 ** 6, timeout=10 ** 6).text),
+        ("clean", lambda text: (text, clean_text(text))),
+        ("skills", lambda state: (*state, extract_skills(state[1], skill_matcher))),
+        ("role", lambda state: (*state, role_scorer.predict_role(state[2]))),
+        ("ats", lambda state: (*state, ats_scorer.score(state[0], state[2]))),
+        ("predict", lambda state: (state, predict_batch([state[1]], top_k=3, clean=False))),
+    ]
+    value = None
+    for name, fn in stages:
+        start = time.perf_counter()
+        value = fn(value)
+        if timings is not None:
+            timings.setdefault(name, []).append(time.perf_counter() - start)
+    return value
+
+
+def measure_fixture(path, file_type, repeat, skill_matcher, role_scorer, ats_scorer):
+    run_pipeline(path, file_type, skill_matcher, role_scorer, ats_scorer)  # warm caches
+    timings = {}
+    end_to_end = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_pipeline(path, file_type, skill_matcher, role_scorer, ats_scorer, timings)
+        end_to_end.append(time.perf_counter() - start)
+    results = {stage: summarize(samples) for stage, samples in timings.items()}
+    results["end_to_end"] = summarize(end_to_end)
+
+    # Memory is measured on a separate run because tracemalloc slows everything down
+    tracemalloc.start()
+    run_pipeline(path, file_type, skill_matcher, role_scorer, ats_scorer)
+    results["end_to_end"]["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    tracemalloc.stop()
+    return results
+
+
+def measure_batch_predict(data_path, repeat):
+    cleaned = [clean_text(t) for t in pd.read_csv(data_path)["Resume"].dropna()]
+    samples = []
+    for _ in range(max(1, repeat // 4)):
+        start = time.perf_counter()
+        predict_batch(cleaned, top_k=3, clean=False)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, items=len(cleaned))
+
+
+def measure_batch_ats(data_path, repeat, skill_matcher, ats_scorer):
+    texts = pd.read_csv(data_path)["Resume"].dropna().tolist()
+    skills = [extract_skills(clean_text(t), skill_matcher) for t in texts]
+    samples = []
+    for _ in range(max(1, repeat // 4)):
+        start = time.perf_counter()
+        ats_scorer.score_batch(texts, skills)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, items=len(texts))
+
+
+def run_benchmarks(repeat=20, sizes=tuple(SIZES), data_path=DATA_PATH, fixture_dir=FIXTURE_DIR):
+    role_skills = registry.get(ROLE_SKILLS_PATH)
+    skill_matcher = registry.get(ROLE_SKILLS_PATH, SkillMatcher.from_pickles)
+    role_scorer = registry.get(ROLE_SKILLS_PATH, RoleScorer.from_pickle)
+    ats_scorer = registry.get(ROLE_SKILLS_PATH, ATSScorer.from_pickle)
+    warm_up()
+
+    results = {}
+    for name, path, file_type in build_fixtures(role_skills, sizes, fixture_dir, data_path):
+        for stage, summary in measure_fixture(path, file_type, repeat, skill_matcher, role_scorer, ats_scorer).items():
+            results[f"{name}/{stage}"] = summary
+    results["corpus/all/predict_batch"] = measure_batch_predict(data_path, repeat)
+    results["corpus/all/ats_batch"] = measure_batch_ats(data_path, repeat, skill_matcher, ats_scorer)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+# -------------------------------
+# 3. Baseline Comparison
+# -------------------------------
+def compare(current, baseline, threshold=0.10, metric="median_ms", min_delta_ms=MIN_DELTA_MS):
+    """Return ``(rows, regressions)`` comparing ``metric`` for every benchmark in both reports.
+
+    A benchmark regresses when it is slower by more than ``threshold`` (relative)
+    and by more than ``min_delta_ms`` (absolute).
+    """
+    rows, regressions = [], []
+    for key, entry in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None or not base.get(metric):
+            continue
+        change = entry[metric] / base[metric] - 1
+        rows.append((key, base[metric], entry[metric], change))
+        if change > threshold and entry[metric] - base[metric] > min_delta_ms:
+            regressions.append(key)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume screening pipeline.")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per fixture")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--quick", action="store_true", help="Small fixtures and 5 repeats")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown of median latency before failing (0.10 = 10%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeat, args.sizes = 5, ["small"]
+    report = run_benchmarks(args.repeat, args.sizes)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<36} {'median ms':>10} {'p95 ms':>10} {'per sec':>10}")
+    for key, entry in report["results"].items():
+        print(f"{key:<36} {entry['median_ms']:>10.3f} {entry['p95_ms']:>10.3f} {entry['throughput_per_sec'] or 0:>10.1f}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows, regressions = compare(report, baseline, args.threshold, min_delta_ms=args.min_delta_ms)
+        print(f"\n{'benchmark':<36} {'base ms':>10} {'now ms':>10} {'change':>8}")
+        for key, base, now, change in rows:
+            flag = "  ⚠" if key in regressions else ""
+            print(f"{key:<36} {base:>10.3f} {now:>10.3f} {change:>+8.1%}{flag}")
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%} "
+                  f"and {args.min_delta_ms:g} ms")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# src/bundle.py
+# Versioned model bundle: plain .npy arrays plus a manifest with checksums.
+#
+#   python src/bundle.py --from-pickles src/model.pkl src/vectorizer.pkl -o models/resume_classifier
+#   python src/bundle.py --from-bundle models/resume_classifier --dtype float32 -o models/resume_float32
+#
+# Every array is a separate .npy file so it can be opened with mmap_mode="r";
+# worker processes that load the same bundle then share the pages through the OS
+# page cache instead of each unpickling a private copy.
+#
+# Because running processes map those files, a file is never rewritten in
+# place: arrays are written under names that carry the model version, and the
+# manifest is swapped last to point at them. Processes that still map the old
+# files keep reading them; the previous version's files are kept for loaders
+# that read the old manifest just before the swap, older ones are removed.
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+
+import numpy as np
+
+FORMAT_VERSION = 1
+BUNDLE_DIR = "models/resume_classifier"
+MANIFEST = "manifest.json"
+MANIFEST_PATH = os.path.join(BUNDLE_DIR, MANIFEST)
+
+# TfidfVectorizer settings that affect transform(); everything else is fit-time only
+VECTORIZER_KEYS = [
+    "analyzer", "binary", "lowercase", "ngram_range", "norm", "smooth_idf", "stop_words",
+    "strip_accents", "sublinear_tf", "token_pattern", "use_idf",
+]
+
+
+_ARRAY_FILE = re.compile(r"^[a-z_]+(-[0-9a-f]{16})?\.npy$")
+
+
+def _sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class BundleError(ValueError):
+    pass
+
+
+def _fsync_dir(path):
+    if hasattr(os, "O_DIRECTORY"):  # not available (or needed) on Windows
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _read_manifest(path):
+    try:
+        with open(os.path.join(path, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# -------------------------------
+# 1. Writing
+# -------------------------------
+def save_bundle(model, vectorizer, path=BUNDLE_DIR, dtype=None, training=None):
+    """Write a fitted TfidfVectorizer + LogisticRegression as a bundle.
+
+    ``dtype`` optionally downcasts the float arrays, e.g. ``np.float32``. The
+    stop word list is written out too, so src/inference.py can replay the
+    vectorizer without scikit-learn. Role tables are not part of the bundle:
+    src/role_skills.pkl is their only copy. ``training`` (which data and split
+    the model was fitted on, see train.py) is stored in the manifest as is.
+    """
+    os.makedirs(path, exist_ok=True)
+    params = vectorizer.get_params()
+    if not isinstance(params["stop_words"], (str, type(None))):
+        params["stop_words"] = sorted(params["stop_words"])
+
+    # vocabulary_ columns are in sorted term order, so column i is terms[i].
+    # UTF-8 bytes take a quarter of the space of a unicode array.
+    terms = np.array([t.encode("utf-8") for t in vectorizer.get_feature_names_out()])
+    float_dtype = np.dtype(dtype) if dtype is not None else model.coef_.dtype
+    arrays = {
+        "terms": terms,
+        "idf": vectorizer.idf_.astype(float_dtype),
+        "coef": np.ascontiguousarray(model.coef_, dtype=float_dtype),
+        "intercept": model.intercept_.astype(float_dtype),
+        "classes": np.asarray(model.classes_).astype(str),
+    }
+    stop_words = vectorizer.get_stop_words()
+    if stop_words:
+        arrays["stop_words"] = np.array(sorted(stop_words))
+
+    # Arrays go to temporary files first: the version is only known once all are hashed
+    files, tmp_paths = {}, {}
+    for name, array in arrays.items():
+        tmp_paths[name] = os.path.join(path, f".{name}.npy.tmp-{os.getpid()}")
+        with open(tmp_paths[name], "wb") as f:
+            np.save(f, array, allow_pickle=False)
+            f.flush()
+            os.fsync(f.fileno())
+        files[name] = {
+            "sha256": _sha256(tmp_paths[name]),
+            "shape": list(array.shape),
+            "dtype": array.dtype.str,
+        }
+    # Content hash of all arrays; changes whenever the model does
+    version = hashlib.sha256("".join(files[name]["sha256"] for name in sorted(files)).encode()).hexdigest()[:16]
+    for name, entry in files.items():
+        entry["file"] = f"{name}-{version}.npy"
+        # A new inode replaces the name; a process that mapped an older file keeps its pages
+        os.replace(tmp_paths[name], os.path.join(path, entry["file"]))
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model_version": version,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "vectorizer": {key: params[key] for key in VECTORIZER_KEYS},
+        "model": {"type": type(model).__name__, "n_features": int(model.coef_.shape[1])},
+        "training": training,
+        "files": {name: files[name] for name in arrays},
+    }
+    # Manifest goes last: its mtime is what the artifact registry watches
+    previous = _read_manifest(path)
+    _fsync_dir(path)
+    tmp_path = os.path.join(path, MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(path, MANIFEST))
+    _fsync_dir(path)
+
+    keep = {entry["file"] for m in (manifest, previous) if m for entry in m["files"].values()}
+    for file_name in os.listdir(path):
+        if _ARRAY_FILE.match(file_name) and file_name not in keep:
+            os.remove(os.path.join(path, file_name))
+    return manifest
+
+# -------------------------------
+# 2. Loading
+# -------------------------------
+class ArtifactBundle:
+    """Memory-mapped view of a bundle written by ``save_bundle``."""
+
+    def __init__(self, path, arrays, manifest):
+        self.path = path
+        self.manifest = manifest
+        self.version = manifest["model_version"]
+        self.terms = arrays["terms"]
+        self.idf = arrays["idf"]
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.classes = arrays["classes"]
+        self.stop_words = arrays.get("stop_words")  # absent in bundles written before it was added
+        self._vocabulary = None
+
+    @property
+    def vocabulary(self):
+        """term -> column dict, built on first use."""
+        if self._vocabulary is None:
+            self._vocabulary = {term.decode("utf-8"): i for i, term in enumerate(self.terms.tolist())}
+        return self._vocabulary
+
+    def vectorizer(self):
+        """A TfidfVectorizer equivalent to the one the bundle was written from."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = dict(self.manifest["vectorizer"])
+        params["ngram_range"] = tuple(params["ngram_range"])
+        vectorizer = TfidfVectorizer(vocabulary=self.vocabulary, dtype=np.float64, **params)
+        vectorizer.idf_ = np.asarray(self.idf, dtype=np.float64)
+        return vectorizer
+
+    def model(self):
+        """The classifier, with the memory-mapped arrays as its coefficients."""
+        from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+        if self.manifest["model"]["type"] == "SGDClassifier":
+            # Written by incremental.py; probabilities are normalized one-vs-rest, not softmax
+            model = SGDClassifier(loss="log_loss")
+        else:
+            model = LogisticRegression()
+            model.n_iter_ = np.zeros(1, dtype=np.int32)
+        model.classes_ = np.asarray(self.classes, dtype=object)
+        model.coef_ = self.coef
+        model.intercept_ = self.intercept
+        model.n_features_in_ = self.coef.shape[1]
+        return model
+
+
+def load_bundle(path=BUNDLE_DIR, mmap_mode="r", verify=False):
+    """Open a bundle directory (or its manifest.json); ``verify`` checks every file's SHA-256."""
+    if os.path.basename(path) == MANIFEST:
+        path = os.path.dirname(path)
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise BundleError(f"Unsupported bundle format {manifest.get('format_version')} in {path}")
+
+    arrays = {}
+    for name, entry in manifest["files"].items():
+        file_path = os.path.join(path, entry["file"])
+        if verify and _sha256(file_path) != entry["sha256"]:
+            raise BundleError(f"Checksum mismatch for {file_path}")
+        arrays[name] = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+    return ArtifactBundle(path, arrays, manifest)
+
+
+def load_classifier(path=BUNDLE_DIR):
+    """``(model, vectorizer)`` rebuilt from a bundle; the loader used with the artifact registry."""
+    bundle = load_bundle(path)
+    return bundle.model(), bundle.vectorizer()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert pickled model artifacts or another bundle into a bundle.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-pickles", nargs=2, metavar=("MODEL", "VECTORIZER"))
+    source.add_argument("--from-bundle", metavar="DIR", help="Re-export a bundle, e.g. with --dtype float32")
+    parser.add_argument("--dtype", choices=["float64", "float32"], help="Float type of the saved arrays")
+    parser.add_argument("-o", "--output", default=BUNDLE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.from_bundle:
+        # Safe when the output is the source directory: save_bundle writes new files and swaps the manifest
+        bundle = load_bundle(args.from_bundle, mmap_mode=None)
+        loaded = [bundle.model(), bundle.vectorizer()]
+        training = bundle.manifest.get("training")
+    else:
+        loaded, training = [], None
+        for pkl_path in args.from_pickles:
+            with open(pkl_path, "rb") as f:
+                loaded.append(pickle.load(f))
+    manifest = save_bundle(*loaded, path=args.output, dtype=args.dtype, training=training)
+    print(f"✅ Bundle {manifest['model_version']} saved in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
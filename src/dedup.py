@@ -0,0 +1,255 @@
+# src/dedup.py
+# Near-duplicate resume detection with MinHash signatures and LSH banding.
+#
+#   python src/dedup.py data/Resume.csv              # report duplicate rows
+#   python src/dedup.py data/Resume.csv --threshold 0.9
+#
+# A resume is the set of word 3-grams of its cleaned text. Its MinHash signature
+# estimates Jaccard similarity between two such sets; cutting the signature into
+# bands and bucketing each band means only resumes sharing at least one bucket
+# are ever compared, so checking a new resume costs the same no matter how many
+# are stored.
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16             # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+SHINGLE_SIZE = 3
+THRESHOLD = 0.8
+SEED = 1
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+# -------------------------------
+# 1. MinHash Signatures
+# -------------------------------
+def shingles(cleaned, k=SHINGLE_SIZE):
+    """Unique 32-bit hashes of the word k-grams of an already cleaned text."""
+    tokens = cleaned.split()
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    token_hashes = {}
+    hashes = np.fromiter(
+        (token_hashes.get(t) or token_hashes.setdefault(t, zlib.crc32(t.encode())) for t in tokens),
+        dtype=np.uint64, count=len(tokens),
+    )
+    k = min(k, len(tokens))
+    combined = hashes[:len(hashes) - k + 1].copy()
+    with np.errstate(over="ignore"):
+        for i in range(1, k):
+            combined = combined * np.uint64(0x9E3779B1) + hashes[i:len(hashes) - k + 1 + i]
+    return np.unique(combined & _MASK32)
+
+
+class MinHasher:
+    """``num_perm`` multiply-shift hash functions; the same seed gives comparable signatures."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def signature(self, cleaned):
+        """uint32 signature of a cleaned text; empty texts get an all-max signature."""
+        values = shingles(cleaned)
+        if len(values) == 0:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        with np.errstate(over="ignore"):
+            hashed = (self.a[:, None] * values[None, :] + self.b[:, None]) >> _SHIFT32
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(sig_a == sig_b))
+
+# -------------------------------
+# 2. LSH Signature Store
+# -------------------------------
+class DuplicateIndex:
+    """Stored signatures bucketed by LSH band, in SQLite (``path``) or in memory.
+
+    ``check`` is the ingest entry point: it returns the best stored match at or
+    above ``threshold`` and then adds the new resume so later copies find it.
+    Bulk loaders can pass ``autocommit=False`` and call ``commit`` per batch.
+
+    Rows are keyed by the SHA-256 of the cleaned text, not by the caller's id:
+    ids such as CSV row numbers repeat from one input to the next, and keying
+    on them would overwrite earlier resumes. The id is kept as the label that
+    matches are reported under (the first one a text was seen with).
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path=None, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD, seed=SEED,
+                 autocommit=True):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.autocommit = autocommit
+        # Mix the band number in so one indexed column can hold every band's buckets
+        rng = np.random.default_rng(seed + 1)
+        self._band_mix = rng.integers(1, 2 ** 63, (bands, self.rows), dtype=np.uint64) | np.uint64(1)
+        self._band_salt = np.arange(bands, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        has_tables = self._db.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'signatures'").fetchone()[0]
+        if has_tables and version != self.SCHEMA_VERSION:
+            self._db.close()
+            raise ValueError(f"Signature store {path} has an older format; move it aside and rebuild it")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS signatures (key TEXT PRIMARY KEY, id TEXT, signature BLOB, "
+            "duplicate_of TEXT, similarity REAL, added_at REAL);"
+            "CREATE TABLE IF NOT EXISTS buckets (bucket INTEGER, key TEXT);"
+            "CREATE INDEX IF NOT EXISTS buckets_by_bucket ON buckets (bucket);"
+            "CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (key);"
+            "CREATE INDEX IF NOT EXISTS signatures_by_id ON signatures (id);"
+            f"PRAGMA user_version = {self.SCHEMA_VERSION};"
+        )
+        self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    @staticmethod
+    def content_key(cleaned):
+        return hashlib.sha256(cleaned.encode("utf-8")).hexdigest()
+
+    def signature(self, cleaned):
+        return self.hasher.signature(cleaned)
+
+    def _buckets(self, signature):
+        bands = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        with np.errstate(over="ignore"):
+            keys = (bands * self._band_mix).sum(axis=1) ^ self._band_salt
+        return [int(k) for k in keys.view(np.int64)]
+
+    def query(self, signature):
+        """Stored ``(id, similarity)`` pairs at or above the threshold, most similar first."""
+        buckets = self._buckets(signature)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT s.id, s.signature FROM signatures s WHERE s.key IN ("
+                f"SELECT key FROM buckets WHERE bucket IN ({','.join('?' * len(buckets))}))",
+                buckets,
+            ).fetchall()
+        matches = []
+        for doc_id, blob in rows:
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold:
+                matches.append((doc_id, score))
+        matches.sort(key=lambda m: -m[1])
+        return matches
+
+    def add(self, doc_id, signature, key, duplicate_of=None, score=None):
+        """Store a signature under its content ``key``; a text that is already stored keeps its first id."""
+        buckets = self._buckets(signature)
+        with self._lock:
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO signatures VALUES (?, ?, ?, ?, ?, ?)",
+                (key, str(doc_id), signature.astype(np.uint32).tobytes(), duplicate_of, score, time.time()),
+            ).rowcount
+            if inserted:
+                self._db.executemany("INSERT INTO buckets VALUES (?, ?)", [(b, key) for b in buckets])
+            if self.autocommit:
+                self._db.commit()
+
+    def remove(self, doc_id):
+        """Drop every stored text labelled ``doc_id``."""
+        with self._lock:
+            self._db.execute("DELETE FROM buckets WHERE key IN (SELECT key FROM signatures WHERE id = ?)",
+                             (str(doc_id),))
+            self._db.execute("DELETE FROM signatures WHERE id = ?", (str(doc_id),))
+            if self.autocommit:
+                self._db.commit()
+
+    def commit(self):
+        with self._lock:
+            self._db.commit()
+
+    def check(self, doc_id, cleaned, add=True):
+        """``(duplicate_of, similarity)`` for the best stored match, or ``(None, None)``.
+
+        Empty texts are never reported as duplicates. With ``add`` the resume is
+        stored afterwards, duplicate or not. The only stored row a resume is not
+        compared with is itself: the same text already stored under the same
+        id (e.g. the same file screened twice). For that row the answer from the
+        first check is returned again, so re-runs report the same duplicates.
+        """
+        if not cleaned.strip():
+            return None, None
+        doc_id = str(doc_id)
+        key = self.content_key(cleaned)
+        with self._lock:
+            seen = self._db.execute(
+                "SELECT duplicate_of, similarity FROM signatures WHERE key = ? AND id = ?", (key, doc_id)
+            ).fetchone()
+        if seen is not None:
+            return (seen[0], seen[1]) if seen[0] is not None else (None, None)
+        signature = self.signature(cleaned)
+        matches = self.query(signature)
+        duplicate_of, score = matches[0] if matches else (None, None)
+        if add:
+            self.add(doc_id, signature, key, duplicate_of, score)
+        return duplicate_of, score
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+def find_duplicates(cleaned_texts, threshold=THRESHOLD, **kwargs):
+    """For a list of cleaned texts, map each near-duplicate position to the earliest one it repeats.
+
+    Single pass: each text is checked against the ones before it, then stored.
+    """
+    index = DuplicateIndex(threshold=threshold, autocommit=False, **kwargs)
+    duplicates = {}
+    try:
+        for i, cleaned in enumerate(cleaned_texts):
+            match, _ = index.check(str(i), cleaned)
+            if match is not None:
+                original = int(match)
+                duplicates[i] = duplicates.get(original, original)
+    finally:
+        index.close()
+    return duplicates
+
+
+def main(argv=None):
+    import pandas as pd
+    from screening import clean_text
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate resumes in a CSV.")
+    parser.add_argument("csv", help="CSV with a 'Resume' column")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Minimum estimated Jaccard similarity")
+    args = parser.parse_args(argv)
+
+    texts = pd.read_csv(args.csv)["Resume"]
+    start = time.perf_counter()
+    duplicates = find_duplicates([clean_text(t) if isinstance(t, str) else "" for t in texts], args.threshold)
+    elapsed = time.perf_counter() - start
+    print(f"{len(duplicates)} of {len(texts)} rows are near-duplicates of an earlier row "
+          f"({len(texts) - len(duplicates)} unique) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
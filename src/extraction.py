@@ -0,0 +1,186 @@
+# src/extraction.py
+# Resume text extraction with size, page and time budgets.
+
+import io
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_TYPE = "text/plain"
+
+EXTENSION_TYPES = {
+    ".pdf": PDF_TYPE,
+    ".docx": DOCX_TYPE,
+    ".txt": TXT_TYPE,
+}
+
+MAX_BYTES = 10 * 1024 * 1024   # reject uploads bigger than this
+MAX_PAGES = 50                 # only the first MAX_PAGES pages of a PDF are read
+TIMEOUT = 10.0                 # seconds; pages not extracted by then are dropped
+PARALLEL_MIN_PAGES = 16        # smaller PDFs are not worth shipping to other processes
+PAGES_PER_TASK = 8
+
+ExtractionResult = namedtuple("ExtractionResult", ["text", "pages", "truncated", "seconds"])
+
+
+class ExtractionError(ValueError):
+    pass
+
+
+class FileTooLargeError(ExtractionError):
+    pass
+
+# -------------------------------
+# 1. Per-format Timing
+# -------------------------------
+class ExtractionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._formats = {}
+
+    def record(self, file_type, seconds, pages):
+        with self._lock:
+            entry = self._formats.setdefault(file_type, {"count": 0, "seconds": 0.0, "pages": 0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["pages"] += pages
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                file_type: dict(entry, ms_per_file=round(1000 * entry["seconds"] / entry["count"], 3))
+                for file_type, entry in self._formats.items()
+            }
+
+
+stats = ExtractionStats()
+
+# -------------------------------
+# 2. Input Handling
+# -------------------------------
+def _check_size(source, max_bytes):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        size = len(source)
+    else:
+        size = os.path.getsize(source)
+    if size > max_bytes:
+        raise FileTooLargeError(f"File is larger than the {max_bytes / (1024 * 1024):g} MB limit")
+
+
+def _open_pdf(source):
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source, filetype="pdf")
+
+# -------------------------------
+# 3. Format Extractors
+# -------------------------------
+def _pdf_pages(source, start, stop):
+    with _open_pdf(source) as pdf:
+        return [pdf[i].get_text() for i in range(start, stop)]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None or _executor._max_workers < workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def _extract_pdf(source, max_pages, deadline, workers):
+    with _open_pdf(source) as pdf:
+        n_pages = min(pdf.page_count, max_pages)
+        truncated = pdf.page_count > max_pages
+
+        if workers <= 1 or n_pages < PARALLEL_MIN_PAGES:
+            pages = []
+            for i in range(n_pages):
+                if time.perf_counter() > deadline:
+                    return pages, True
+                pages.append(pdf[i].get_text())
+            return pages, truncated
+
+    # Each task reopens the document and extracts a contiguous page range
+    executor = _get_executor(workers)
+    futures = [
+        executor.submit(_pdf_pages, source, start, min(start + PAGES_PER_TASK, n_pages))
+        for start in range(0, n_pages, PAGES_PER_TASK)
+    ]
+    done, not_done = wait(futures, timeout=max(deadline - time.perf_counter(), 0))
+    for future in not_done:
+        future.cancel()
+    pages = []
+    for future in futures:
+        if future in done and future.exception() is None:
+            pages.extend(future.result())
+        else:
+            truncated = True
+    return pages, truncated
+
+
+def _extract_docx(source):
+    import docx2txt
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    return docx2txt.process(source)
+
+
+def _extract_txt(source):
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        with open(source, "rb") as f:
+            source = f.read()
+    source = bytes(source)
+    try:
+        return source.decode("utf-8")
+    except UnicodeDecodeError:
+        # Most non-UTF-8 resumes are saved by Windows editors
+        return source.decode("cp1252", errors="replace")
+
+
+def extract(source, file_type, max_bytes=MAX_BYTES, max_pages=MAX_PAGES, timeout=TIMEOUT, workers=1):
+    """Extract text from a PDF, DOCX or TXT resume given as bytes or a file path.
+
+    Files over ``max_bytes`` raise FileTooLargeError, and files the format's
+    reader cannot open (corrupt PDFs, DOCX files that are not zip archives)
+    raise ExtractionError. PDFs are read page by page and joined once at the
+    end; at most ``max_pages`` pages are read, and pages not finished within
+    ``timeout`` seconds are dropped (``truncated`` is set in both cases). With
+    ``workers > 1`` long PDFs are split across a process pool; that is meant
+    for command-line use, servers (app.py, service.py) keep the default. TXT
+    files that are not UTF-8 are read as cp1252.
+    """
+    start = time.perf_counter()
+    _check_size(source, max_bytes)
+    pages, truncated = [], False
+    try:
+        if file_type == PDF_TYPE:
+            pages, truncated = _extract_pdf(source, max_pages, start + timeout, workers)
+            text = "".join(pages)
+        elif file_type == DOCX_TYPE:
+            text = _extract_docx(source)
+        elif file_type == TXT_TYPE:
+            text = _extract_txt(source)
+        else:
+            text = ""
+    except (OSError, ImportError):
+        raise
+    except Exception as e:
+        # PyMuPDF and docx2txt raise their own error types for malformed files
+        raise ExtractionError(f"Could not read the file; it may be damaged ({type(e).__name__}: {e})") from e
+    seconds = time.perf_counter() - start
+    stats.record(file_type, seconds, len(pages))
+    return ExtractionResult(text, len(pages), truncated, seconds)
@@ -0,0 +1,286 @@
+# src/incremental.py
+# Incremental model updates from newly labeled resumes.
+#
+#   python src/incremental.py init                          # start from the current bundle
+#   python src/incremental.py update --data new_labels.csv  # learn from the new rows only
+#   python src/incremental.py history
+#
+# The featurizer is frozen: the vocabulary and idf of the bundle in models/ when
+# `init` ran, so old and new rows land in the same feature space. An
+# SGDClassifier (log loss) learns with partial_fit from CSV chunks, so an update
+# costs time in the number of new rows plus one fixed-size holdout evaluation.
+# Each update becomes a numbered checkpoint and is published to the bundle
+# unless holdout accuracy dropped by more than --max-drop. `init` only replaces
+# the bundle if the new model scores no worse than it on rows the bundle never
+# trained on: when init runs on the bundle's own training data (recorded in its
+# manifest by train.py) the holdout is train.py's test split. Without such a
+# baseline nothing is published unless --publish is passed. Publishing goes
+# through save_bundle, which never rewrites files a running server has mapped.
+
+import argparse
+import glob
+import os
+import pickle
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.linear_model import SGDClassifier
+
+from bundle import BUNDLE_DIR, load_bundle, save_bundle
+from ingest import iter_batches
+from train import BUNDLE_DTYPE, DATA_PATH, SPLIT_SEED, TEST_SIZE, clean_corpus, file_hash, split_rows
+
+CHECKPOINT_DIR = "models/checkpoints"
+CHUNK_SIZE = 5000
+HOLDOUT_FRACTION = 0.2
+SGD_PARAMS = {"loss": "log_loss", "alpha": 1e-5, "random_state": 42}
+MAX_DROP = 0.02
+KEEP = 5
+
+# -------------------------------
+# 1. Streaming Input
+# -------------------------------
+def iter_labeled_chunks(path, vectorizer, classes, chunk_size=CHUNK_SIZE, n_jobs=1):
+    """Yield ``(X, y, rows)`` per CSV chunk, cleaned and vectorized with the frozen featurizer.
+
+    ``rows`` are the positions of the labeled rows in the file.
+    """
+    known = set(classes)
+    offset = 0
+    for chunk in iter_batches(path, ["Category", "Resume"], chunk_size):
+        labeled = chunk["Category"].notna().to_numpy()
+        rows = offset + np.flatnonzero(labeled)
+        offset += len(chunk)
+        chunk = chunk[labeled]
+        labels = chunk["Category"].to_numpy(dtype=str)
+        unknown = set(labels) - known
+        if unknown:
+            raise ValueError(
+                f"Unknown categories {sorted(map(str, unknown))}; new categories need a full retrain (python src/train.py)"
+            )
+        cleaned = clean_corpus(chunk["Resume"].fillna(""), n_jobs)
+        yield vectorizer.transform(cleaned), labels, rows
+
+# -------------------------------
+# 2. Checkpoints
+# -------------------------------
+def checkpoint_paths(checkpoint_dir=CHECKPOINT_DIR):
+    return sorted(glob.glob(os.path.join(checkpoint_dir, "checkpoint-*.pkl")))
+
+
+def load_latest(checkpoint_dir=CHECKPOINT_DIR):
+    paths = checkpoint_paths(checkpoint_dir)
+    if not paths:
+        raise FileNotFoundError(f"No checkpoints in {checkpoint_dir}; run `python src/incremental.py init` first")
+    with open(paths[-1], "rb") as f:
+        return pickle.load(f)
+
+
+def save_checkpoint(state, checkpoint_dir=CHECKPOINT_DIR, keep=KEEP):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, f"checkpoint-{state['checkpoint']:05d}.pkl")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    for old in checkpoint_paths(checkpoint_dir)[:-keep]:
+        os.remove(old)
+    return path
+
+
+def save_holdout(X, y, checkpoint_dir=CHECKPOINT_DIR):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    sparse.save_npz(os.path.join(checkpoint_dir, "holdout.npz"), X)
+    np.save(os.path.join(checkpoint_dir, "holdout_labels.npy"), y, allow_pickle=False)
+
+
+def holdout_accuracy(model, checkpoint_dir=CHECKPOINT_DIR):
+    X = sparse.load_npz(os.path.join(checkpoint_dir, "holdout.npz"))
+    y = np.load(os.path.join(checkpoint_dir, "holdout_labels.npy"))
+    return float(np.mean(model.predict(X) == y)) if len(y) else None
+
+# -------------------------------
+# 3. Training
+# -------------------------------
+def training_holdout(bundle, data_path, chunk_size=CHUNK_SIZE):
+    """Boolean mask of train.py's test rows if ``bundle`` was trained on ``data_path``, else None."""
+    training = bundle.manifest.get("training") or {}
+    if (training.get("dedupe") or training.get("test_size") != TEST_SIZE or training.get("split_seed") != SPLIT_SEED
+            or training.get("data_sha256") != file_hash(data_path)):
+        return None
+    labels = np.concatenate([chunk["Category"].to_numpy(dtype=str)
+                             for chunk in iter_batches(data_path, ["Category"], chunk_size)])
+    _, test_rows, _, _ = split_rows(np.arange(len(labels)), labels)
+    mask = np.zeros(len(labels), dtype=bool)
+    mask[test_rows] = True
+    return mask
+
+
+def publish(state, bundle_dir=BUNDLE_DIR):
+    # save_bundle writes new versioned files and swaps the manifest, so servers that
+    # mapped the current bundle keep reading consistent arrays until they reload.
+    # Same float type as the bundle init started from (checkpoints from before it was kept: the export default)
+    manifest = save_bundle(state["model"], state["vectorizer"], bundle_dir, dtype=state.get("dtype", BUNDLE_DTYPE))
+    state["published_version"] = manifest["model_version"]
+    return manifest["model_version"]
+
+
+def init(data_path=DATA_PATH, checkpoint_dir=CHECKPOINT_DIR, bundle_dir=BUNDLE_DIR, epochs=5,
+         chunk_size=CHUNK_SIZE, n_jobs=1, seed=42, publish_model=None):
+    """Fit a fresh SGD model on ``data_path`` over the current bundle's vocabulary.
+
+    Some rows are set aside as the holdout every later update is scored on.
+    If the bundle was trained on ``data_path`` they are train.py's test rows,
+    the bundle is scored on them too, and with ``publish_model=None`` the new
+    model is published only if it is at least as accurate. Otherwise a random
+    ``HOLDOUT_FRACTION`` is held out and, with no fair baseline, nothing is
+    published unless ``publish_model=True``. Vectorized training chunks are
+    kept for the extra epochs; sparse rows are far smaller than the raw text.
+    """
+    start = time.perf_counter()
+    bundle = load_bundle(bundle_dir)
+    vectorizer, classes = bundle.vectorizer(), np.asarray(bundle.classes).astype(str)
+    rng = np.random.default_rng(seed)
+    model = SGDClassifier(**SGD_PARAMS)
+    test_rows = training_holdout(bundle, data_path, chunk_size)
+
+    train_chunks, holdout_X, holdout_y = [], [], []
+    for X, y, rows in iter_labeled_chunks(data_path, vectorizer, classes, chunk_size, n_jobs):
+        held = test_rows[rows] if test_rows is not None else rng.random(len(y)) < HOLDOUT_FRACTION
+        holdout_X.append(X[held])
+        holdout_y.append(y[held])
+        train_chunks.append((X[~held], y[~held]))
+    for _ in range(epochs):
+        for X, y in train_chunks:
+            order = rng.permutation(len(y))
+            model.partial_fit(X[order], y[order], classes=classes)
+    save_holdout(sparse.vstack(holdout_X, format="csr"), np.concatenate(holdout_y), checkpoint_dir)
+    # Scoring the bundle on rows it was trained on would make the baseline too high
+    bundle_accuracy = holdout_accuracy(bundle.model(), checkpoint_dir) if test_rows is not None else None
+
+    rows = sum(len(y) for _, y in train_chunks)
+    state = {
+        "checkpoint": 1,
+        "model": model,
+        "vectorizer": vectorizer,
+        "base_version": bundle.version,
+        "base_accuracy": bundle_accuracy,
+        "dtype": bundle.coef.dtype.str,
+        "published_version": None,
+        "rows_seen": rows,
+        "history": [],
+    }
+    return _finish(state, "init", data_path, rows, None, start, checkpoint_dir, bundle_dir, 0.0, publish_model)
+
+
+def update(data_path, checkpoint_dir=CHECKPOINT_DIR, bundle_dir=BUNDLE_DIR, chunk_size=CHUNK_SIZE,
+           n_jobs=1, max_drop=MAX_DROP, publish_model=None, force=False):
+    """partial_fit the latest checkpoint on the rows of ``data_path`` and checkpoint the result.
+
+    Each chunk is scored before it is learned from, which gives an accuracy on
+    unseen data for free. ``publish_model`` is as for ``init``.
+    """
+    start = time.perf_counter()
+    state = load_latest(checkpoint_dir)
+    current = load_bundle(bundle_dir).version
+    if not force and current not in (state["published_version"], state["base_version"]):
+        raise RuntimeError(
+            f"Bundle {current} in {bundle_dir} was replaced since the last checkpoint (full retrain?); "
+            "run `init` again or pass --force to overwrite it"
+        )
+
+    model = state["model"]
+    rows = correct = 0
+    for X, y, _ in iter_labeled_chunks(data_path, state["vectorizer"], model.classes_, chunk_size, n_jobs):
+        if len(y) == 0:
+            continue
+        correct += int(np.sum(model.predict(X) == y))
+        model.partial_fit(X, y)
+        rows += len(y)
+
+    state["checkpoint"] += 1
+    state["rows_seen"] += rows
+    batch_accuracy = correct / rows if rows else None
+    return _finish(state, "update", data_path, rows, batch_accuracy, start, checkpoint_dir, bundle_dir,
+                   max_drop, publish_model)
+
+
+def _finish(state, kind, data_path, rows, batch_accuracy, start, checkpoint_dir, bundle_dir, max_drop, publish_model):
+    """Checkpoint ``state`` and publish it: always (True), never (False), or if it holds up against
+    a baseline (None)."""
+    accuracy = holdout_accuracy(state["model"], checkpoint_dir)
+    # Compared with the last published checkpoint, or with the bundle init started from
+    previous = next((h["holdout_accuracy"] for h in reversed(state["history"]) if h["published"]),
+                    state.get("base_accuracy"))
+    regressed = previous is not None and accuracy is not None and accuracy < previous - max_drop
+    no_baseline = publish_model is None and (previous is None or accuracy is None)
+    if publish_model is None:
+        publish_model = not regressed and not no_baseline
+    published = publish(state, bundle_dir) if publish_model else None
+    entry = {
+        "checkpoint": state["checkpoint"],
+        "kind": kind,
+        "data": data_path,
+        "rows": rows,
+        "rows_seen": state["rows_seen"],
+        "batch_accuracy": batch_accuracy,
+        "holdout_accuracy": accuracy,
+        "baseline_accuracy": previous,
+        "published": published,
+        "seconds": round(time.perf_counter() - start, 3),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    state["history"].append(entry)
+    save_checkpoint(state, checkpoint_dir)
+    if regressed and not published:
+        print(f"⚠  Holdout accuracy fell from {previous:.4f} to {accuracy:.4f}; "
+              f"checkpoint {state['checkpoint']} saved but not published")
+    elif no_baseline:
+        print(f"⚠  No holdout accuracy to compare with (the bundle was not trained on {data_path} by train.py); "
+              f"checkpoint {state['checkpoint']} saved but not published, pass --publish to publish it")
+    return entry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the resume classifier incrementally.")
+    parser.add_argument("--checkpoints", default=CHECKPOINT_DIR)
+    parser.add_argument("--bundle", default=BUNDLE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    init_parser = sub.add_parser("init", help="Fit from scratch on a CSV over the current vocabulary")
+    init_parser.add_argument("--data", default=DATA_PATH)
+    init_parser.add_argument("--epochs", type=int, default=5)
+    update_parser = sub.add_parser("update", help="partial_fit on newly labeled rows")
+    update_parser.add_argument("--data", required=True, help="CSV or Parquet file with 'Category' and 'Resume' columns")
+    update_parser.add_argument("--max-drop", type=float, default=MAX_DROP,
+                               help="Don't publish if holdout accuracy falls by more than this")
+    update_parser.add_argument("--force", action="store_true", help="Publish even if the bundle changed since")
+    for p in (init_parser, update_parser):
+        publish_group = p.add_mutually_exclusive_group()
+        publish_group.add_argument("--publish", dest="publish", action="store_const", const=True,
+                                   help="Publish even without a baseline or after an accuracy drop")
+        publish_group.add_argument("--no-publish", dest="publish", action="store_const", const=False,
+                                   help="Checkpoint only, leave the bundle alone")
+        p.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        p.add_argument("--n-jobs", type=int, default=1, help="Processes for cleaning (-1: all CPUs)")
+    sub.add_parser("history", help="Show accuracy and timing of every kept checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.command == "history":
+        for entry in load_latest(args.checkpoints)["history"]:
+            print(entry)
+        return
+    if args.command == "init":
+        entry = init(args.data, args.checkpoints, args.bundle, args.epochs, args.chunk_size, args.n_jobs,
+                     publish_model=args.publish)
+    else:
+        entry = update(args.data, args.checkpoints, args.bundle, args.chunk_size, args.n_jobs,
+                       args.max_drop, args.publish, args.force)
+    accuracy = "n/a" if entry["holdout_accuracy"] is None else f"{entry['holdout_accuracy']:.4f}"
+    print(f"✅ Checkpoint {entry['checkpoint']}: {entry['rows']} rows in {entry['seconds']}s, "
+          f"holdout accuracy {accuracy}"
+          + (f", published bundle {entry['published']}" if entry["published"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# src/inference.py
+# NumPy-only inference for the resume classifier bundle.
+#
+#   python src/inference.py validate     # compare with the scikit-learn path on data/Resume.csv
+#   python src/inference.py benchmark    # per-resume latency and peak memory of both paths
+#   RESUME_PREDICT_BACKEND=numpy python src/service.py    # serve with it (see src/predict.py)
+#
+# The classifier is a TF-IDF vector times a (classes x 5000) matrix. The kernel
+# replays the vectorizer settings stored in the bundle (token pattern, stop
+# words, n-grams, idf, L2 norm), keeps the coefficients transposed so the
+# non-zero features of a batch gather contiguous rows, and applies softmax (or
+# one-vs-rest sigmoids for an SGDClassifier bundle). Nothing from scikit-learn
+# or SciPy is imported, and a float32 bundle (train.py --dtype float32) is used
+# as is.
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from bundle import BUNDLE_DIR, BundleError, load_bundle
+
+DATA_PATH = "data/Resume.csv"
+
+# -------------------------------
+# 1. Kernel
+# -------------------------------
+class InferenceKernel:
+    """TF-IDF + linear classifier over the arrays of a bundle."""
+
+    def __init__(self, bundle):
+        params = bundle.manifest["vectorizer"]
+        if params["analyzer"] != "word" or params["strip_accents"] is not None:
+            raise BundleError("InferenceKernel supports analyzer='word' without strip_accents only")
+        self.version = bundle.version
+        self.model_type = bundle.manifest["model"]["type"]
+        self.classes = np.asarray(bundle.classes)
+        self.vocabulary = bundle.vocabulary
+        self.idf = np.asarray(bundle.idf) if params["use_idf"] else None
+        self.dtype = np.asarray(bundle.coef).dtype
+        # (n_features, n_classes): the rows of one document's features are gathered in one step
+        self.coef_t = np.ascontiguousarray(np.asarray(bundle.coef).T)
+        self.intercept = np.asarray(bundle.intercept)
+        self.lowercase = params["lowercase"]
+        self.binary = params["binary"]
+        self.sublinear_tf = params["sublinear_tf"]
+        self.norm = params["norm"]
+        self.ngram_range = tuple(params["ngram_range"])
+        self.token_re = re.compile(params["token_pattern"])
+        self.stop_words = self._stop_words(bundle, params["stop_words"])
+
+    @staticmethod
+    def _stop_words(bundle, setting):
+        if bundle.stop_words is not None:
+            return frozenset(bundle.stop_words.tolist())
+        if setting is None:
+            return frozenset()
+        if isinstance(setting, list):
+            return frozenset(setting)
+        # Bundles written before the list was stored; re-export with src/bundle.py --from-bundle to drop this import
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+        return ENGLISH_STOP_WORDS
+
+    @classmethod
+    def from_bundle(cls, path=BUNDLE_DIR):
+        """The loader used with the artifact registry (accepts the bundle directory or its manifest)."""
+        return cls(load_bundle(path))
+
+    def analyze(self, text):
+        """The n-grams TfidfVectorizer's word analyzer would produce."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_re.findall(text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        grams = tokens if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            grams = grams + [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return grams
+
+    def transform(self, texts):
+        """TF-IDF rows as CSR arrays ``(indptr, indices, data)``."""
+        vocabulary = self.vocabulary
+        indptr, indices, counts = [0], [], []
+        for text in texts:
+            row = {}
+            for gram in self.analyze(text):
+                j = vocabulary.get(gram)
+                if j is not None:
+                    row[j] = row.get(j, 0) + 1
+            indices.extend(row)
+            counts.extend(row.values())
+            indptr.append(len(indices))
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int64)
+        data = np.array(counts, dtype=self.dtype)
+        if self.binary:
+            data[:] = 1
+        elif self.sublinear_tf:
+            data = 1 + np.log(data)
+        if self.idf is not None:
+            data *= self.idf[indices]
+        if self.norm is not None:
+            rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            if self.norm == "l2":
+                norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(indptr) - 1))
+            else:
+                norms = np.bincount(rows, weights=np.abs(data), minlength=len(indptr) - 1)
+            norms[norms == 0] = 1
+            data /= norms[rows].astype(self.dtype)
+        return indptr, indices, data
+
+    def decision_function(self, texts):
+        indptr, indices, data = self.transform(texts)
+        scores = np.tile(self.intercept, (len(indptr) - 1, 1))
+        nonempty = np.flatnonzero(np.diff(indptr))
+        if len(nonempty):
+            # Empty rows have no entries, so each non-empty row's sum runs to the next non-empty start
+            contributions = data[:, None] * self.coef_t[indices]
+            scores[nonempty] += np.add.reduceat(contributions, indptr[nonempty], axis=0)
+        return scores
+
+    def predict_proba(self, texts):
+        scores = self.decision_function(texts).astype(np.float64)
+        if scores.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        if self.model_type == "SGDClassifier":
+            # One-vs-rest probabilities, normalized as SGDClassifier.predict_proba does
+            proba = 1 / (1 + np.exp(-scores))
+            total = proba.sum(axis=1, keepdims=True)
+            return np.divide(proba, total, out=np.full_like(proba, 1 / proba.shape[1]), where=total != 0)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, texts):
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            return self.classes[(scores[:, 0] > 0).astype(int)]
+        return self.classes[scores.argmax(axis=1)]
+
+# -------------------------------
+# 2. Validation and Benchmark
+# -------------------------------
+def load_texts(data_path=DATA_PATH):
+    """Cleaned resumes from a CSV, read with the csv module so the kernel's process stays free of pandas."""
+    import csv
+
+    from screening import clean_text
+
+    csv.field_size_limit(sys.maxsize)
+    with open(data_path, newline="", encoding="utf-8") as f:
+        return [clean_text(row["Resume"] or "") for row in csv.DictReader(f)]
+
+
+def validate(bundle_dir=BUNDLE_DIR, data_path=DATA_PATH, tolerance=1e-4, reference_dir=None):
+    """Kernel vs scikit-learn on every resume of ``data_path``; returns a summary dict.
+
+    ``reference_dir`` is the bundle scikit-learn runs, e.g. the float64 bundle a
+    float32 export was made from; by default the same bundle.
+    """
+    from bundle import load_classifier
+
+    texts = load_texts(data_path)
+    model, vectorizer = load_classifier(reference_dir or bundle_dir)
+    kernel = InferenceKernel.from_bundle(bundle_dir)
+    expected = model.predict_proba(vectorizer.transform(texts))
+    actual = kernel.predict_proba(texts)
+    max_diff = float(np.abs(expected - actual).max()) if len(texts) else 0.0
+    agree = int(np.sum(model.classes_[expected.argmax(axis=1)] == kernel.classes[actual.argmax(axis=1)]))
+    return {
+        "resumes": len(texts),
+        "bundle_dtype": str(kernel.dtype),
+        "max_abs_proba_diff": max_diff,
+        "label_agreement": agree,
+        "ok": max_diff <= tolerance and agree == len(texts),
+    }
+
+
+def _measure(backend, bundle_dir, data_path, limit):
+    """Runs in a fresh interpreter so import time and peak RSS belong to one backend."""
+    import resource
+
+    texts = load_texts(data_path)[:limit]
+    start = time.perf_counter()
+    if backend == "numpy":
+        kernel = InferenceKernel.from_bundle(bundle_dir)
+        predict = kernel.predict_proba
+    else:
+        from bundle import load_classifier
+
+        model, vectorizer = load_classifier(bundle_dir)
+        predict = lambda batch: model.predict_proba(vectorizer.transform(batch))  # noqa: E731
+    load_sec = time.perf_counter() - start
+
+    predict(texts[:10])  # warm up
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        predict([text])
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    predict(texts)
+    batch_sec = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "backend": backend,
+        "load_ms": round(1000 * load_sec, 1),
+        "median_ms": round(1000 * statistics.median(latencies), 4),
+        "p95_ms": round(1000 * latencies[int(0.95 * (len(latencies) - 1))], 4),
+        "batch_ms_per_resume": round(1000 * batch_sec / len(texts), 4),
+        "sklearn_imported": "sklearn" in sys.modules,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def benchmark(bundle_dir=BUNDLE_DIR, data_path=DATA_PATH, limit=None):
+    results = []
+    for backend in ("sklearn", "numpy"):
+        cmd = [sys.executable, os.path.abspath(__file__), "_measure", backend, "--bundle", bundle_dir, "--data", data_path]
+        if limit:
+            cmd += ["--limit", str(limit)]
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        results.append(json.loads(proc.stdout))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate or benchmark the NumPy inference kernel.")
+    parser.add_argument("command", choices=["validate", "benchmark", "_measure"])
+    parser.add_argument("backend", nargs="?", choices=["sklearn", "numpy"], help=argparse.SUPPRESS)
+    parser.add_argument("--bundle", default=BUNDLE_DIR)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--reference", help="Bundle for the scikit-learn side of validate (default: --bundle)")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Largest allowed probability difference")
+    parser.add_argument("--limit", type=int, help="Benchmark on the first N resumes only")
+    args = parser.parse_args(argv)
+
+    if args.command == "_measure":
+        print(json.dumps(_measure(args.backend, args.bundle, args.data, args.limit)))
+    elif args.command == "validate":
+        summary = validate(args.bundle, args.data, args.tolerance, args.reference)
+        print(json.dumps(summary, indent=2))
+        if not summary["ok"]:
+            sys.exit(1)
+    else:
+        print(f"{'backend':<10} {'load ms':>9} {'median ms':>10} {'p95 ms':>9} {'batch ms':>9} {'peak MB':>8}  sklearn")
+        for r in benchmark(args.bundle, args.data, args.limit):
+            print(f"{r['backend']:<10} {r['load_ms']:>9.1f} {r['median_ms']:>10.3f} {r['p95_ms']:>9.3f} "
+                  f"{r['batch_ms_per_resume']:>9.3f} {r['peak_rss_mb']:>8.1f}  {'imported' if r['sklearn_imported'] else '-'}")
+
+
+if __name__ == "__main__":
+    main()
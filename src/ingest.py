@@ -0,0 +1,216 @@
+# src/ingest.py
+# Chunked reading of large resume exports.
+#
+#   python src/ingest.py data/Resume.csv -o .cache/resume_clean.parquet
+#
+# CSV files are read as pandas chunks and Parquet files as pyarrow record
+# batches, so only one batch of raw text is in memory at a time. The cleaned
+# corpus is written to Parquet with one row group per batch; later passes
+# (fitting a vectorizer, transforming, deduplicating) stream the single column
+# they need back from it instead of re-reading and re-cleaning the CSV.
+
+import argparse
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from screening import clean_text
+
+CHUNK_SIZE = 5000
+TEXT_COLUMN = "Resume"
+CLEANED_COLUMN = "Cleaned_Resume"
+
+# -------------------------------
+# 1. Reading
+# -------------------------------
+def iter_batches(path, columns=None, batch_size=CHUNK_SIZE):
+    """DataFrames of at most ``batch_size`` rows from a CSV or Parquet file."""
+    if path.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_size, usecols=columns)
+
+
+def iter_column(path, column=CLEANED_COLUMN, rows=None, batch_size=CHUNK_SIZE):
+    """Stream the values of one column, optionally only the row positions in ``rows`` (in file order)."""
+    keep = None
+    if rows is not None:
+        rows = np.asarray(rows)
+        keep = rows if rows.dtype == bool else None
+        if keep is None:
+            keep = np.zeros(rows.max() + 1 if len(rows) else 0, dtype=bool)
+            keep[rows] = True
+    offset = 0
+    for batch in iter_batches(path, [column], batch_size):
+        values = batch[column].tolist()
+        if keep is None:
+            yield from values
+        else:
+            mask = keep[offset:offset + len(values)]
+            yield from (v for v, k in zip(values, mask) if k)
+        offset += len(values)
+
+
+def read_column(path, column):
+    """One whole column as a numpy array; meant for small columns such as labels."""
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path, columns=[column]).column(0).to_numpy(zero_copy_only=False)
+
+# -------------------------------
+# 2. Cleaning and Vectorizing
+# -------------------------------
+def _clean_value(text):
+    return clean_text(text) if isinstance(text, str) else ""
+
+
+def clean_to_parquet(path, out_path, text_column=TEXT_COLUMN, batch_size=CHUNK_SIZE, n_jobs=1, clean=_clean_value):
+    """Clean ``text_column`` batch by batch into a Parquet file; returns the row count.
+
+    The other columns (e.g. Category) are kept as strings and the raw text is
+    replaced by ``CLEANED_COLUMN``. ``clean`` must be picklable when ``n_jobs > 1``.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tmp_path = f"{out_path}.tmp"
+    writer = None
+    pool = Pool(n_jobs) if n_jobs > 1 else None
+    rows = 0
+    try:
+        for batch in iter_batches(path, batch_size=batch_size):
+            texts = batch.pop(text_column).tolist()
+            if pool is not None:
+                cleaned = pool.map(clean, texts, chunksize=max(1, len(texts) // (n_jobs * 4)))
+            else:
+                cleaned = [clean(t) for t in texts]
+            columns = {name: [None if pd.isna(v) else str(v) for v in batch[name]] for name in batch.columns}
+            columns[CLEANED_COLUMN] = cleaned
+            if writer is None:
+                schema = pa.schema([(name, pa.string()) for name in columns])
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(pa.table(columns, schema=schema), row_group_size=batch_size)
+            rows += len(texts)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows in {path}")
+    os.replace(tmp_path, out_path)
+    return rows
+
+
+def _batched(values, batch_size):
+    batch = []
+    for value in values:
+        batch.append(value)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _map_batches(fn, batches, n_jobs):
+    """``map(fn, batches)``, in a process pool when ``n_jobs > 1``, keeping order."""
+    if n_jobs <= 1:
+        yield from map(fn, batches)
+        return
+    with Pool(n_jobs) as pool:
+        yield from pool.imap(fn, batches)
+
+
+def _count_terms(task):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    params, texts = task
+    analyze = TfidfVectorizer(**params).build_analyzer()
+    term_counts, doc_counts = Counter(), Counter()
+    for text in texts:
+        features = analyze(text)
+        term_counts.update(features)
+        doc_counts.update(set(features))
+    return term_counts, doc_counts, len(texts)
+
+
+def fit_tfidf(texts, batch_size=CHUNK_SIZE, n_jobs=1, **params):
+    """A TfidfVectorizer fitted on a stream of texts, e.g. ``iter_column(...)``.
+
+    TfidfVectorizer.fit builds a count matrix of every n-gram in the corpus
+    before cutting it down to ``max_features``; here only per-term totals are
+    kept, so memory follows the vocabulary size instead of the corpus size. The
+    term selection and idf follow scikit-learn's rules, so the result matches
+    ``TfidfVectorizer(**params).fit(list(texts))``.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    term_counts, doc_counts = Counter(), Counter()
+    n_docs = 0
+    tasks = ((params, batch) for batch in _batched(texts, batch_size))
+    for batch_terms, batch_docs, batch_n in _map_batches(_count_terms, tasks, n_jobs):
+        term_counts.update(batch_terms)
+        doc_counts.update(batch_docs)
+        n_docs += batch_n
+
+    terms = sorted(term_counts)
+    tfs = np.fromiter((term_counts[t] for t in terms), dtype=np.int64, count=len(terms))
+    dfs = np.fromiter((doc_counts[t] for t in terms), dtype=np.int64, count=len(terms))
+    del term_counts, doc_counts
+
+    vectorizer = TfidfVectorizer(**params)
+    max_df, min_df = vectorizer.max_df, vectorizer.min_df
+    high = max_df if isinstance(max_df, (int, np.integer)) else max_df * n_docs
+    low = min_df if isinstance(min_df, (int, np.integer)) else min_df * n_docs
+    mask = (dfs <= high) & (dfs >= low)
+    if vectorizer.max_features is not None and mask.sum() > vectorizer.max_features:
+        top = (-tfs[mask]).argsort()[:vectorizer.max_features]
+        new_mask = np.zeros(len(dfs), dtype=bool)
+        new_mask[np.where(mask)[0][top]] = True
+        mask = new_mask
+    selected = np.flatnonzero(mask)
+    if len(selected) == 0:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+
+    params = {k: v for k, v in params.items() if k not in ("max_df", "min_df", "max_features")}
+    vectorizer = TfidfVectorizer(vocabulary={terms[i]: j for j, i in enumerate(selected)}, **params)
+    if vectorizer.use_idf:
+        smooth = int(vectorizer.smooth_idf)
+        vectorizer.idf_ = np.log((n_docs + smooth) / (dfs[selected] + smooth)) + 1
+    return vectorizer
+
+
+def _transform(task):
+    vectorizer, texts = task
+    return vectorizer.transform(texts)
+
+
+def transform_column(path, vectorizer, column=CLEANED_COLUMN, batch_size=CHUNK_SIZE, n_jobs=1):
+    """Vectorize a column batch by batch and stack the sparse results."""
+    tasks = ((vectorizer, batch) for batch in _batched(iter_column(path, column, batch_size=batch_size), batch_size))
+    return sparse.vstack(list(_map_batches(_transform, tasks, n_jobs)), format="csr")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean a resume CSV or Parquet file into a Parquet corpus.")
+    parser.add_argument("input", help=f"CSV or Parquet file with a '{TEXT_COLUMN}' column")
+    parser.add_argument("-o", "--output", required=True, help="Parquet file to write")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows read, cleaned and written per batch")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Processes for cleaning")
+    args = parser.parse_args(argv)
+
+    rows = clean_to_parquet(args.input, args.output, batch_size=args.chunk_size, n_jobs=args.n_jobs)
+    print(f"✅ Cleaned {rows} resumes into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
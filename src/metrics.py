@@ -0,0 +1,207 @@
+# src/metrics.py
+# Per-stage timings, input sizes and event counters for the screening pipeline.
+#
+# Disabled by default: stage() then hands back a shared no-op context manager and
+# observe()/inc() return immediately. Enable with RESUME_METRICS=1.
+#
+#   RESUME_METRICS_FILE=metrics.prom   write Prometheus text (node_exporter textfile) after each request
+#   RESUME_METRICS_FILE=metrics.json   ... or a JSON snapshot
+#   RESUME_PROFILE_RATE=0.01           cProfile 1% of requests into RESUME_PROFILE_DIR
+
+import bisect
+import cProfile
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 500000)
+
+PROFILE_RATE = float(os.environ.get("RESUME_PROFILE_RATE", 0))
+PROFILE_DIR = os.environ.get("RESUME_PROFILE_DIR", ".cache/profiles")
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "buckets": {str(le): c for le, c in zip([*self.buckets, "+Inf"], self.counts)},
+        }
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        self.metrics.record_stage(self.name, elapsed, exc_type is not None)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled=False, prefix="resume_screening"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stage_seconds = {}   # stage -> Histogram
+            self._stage_errors = {}    # stage -> count
+            self._sizes = {}           # kind -> Histogram
+            self._events = {}          # event -> count
+
+    # -------------------------------
+    # Recording
+    # -------------------------------
+    def stage(self, name):
+        """Context manager timing one pipeline stage; exceptions are counted as stage errors."""
+        if not self.enabled:
+            return _NOOP_STAGE
+        return _Stage(self, name)
+
+    def record_stage(self, name, seconds, failed=False):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stage_seconds.get(name)
+            if hist is None:
+                hist = self._stage_seconds[name] = Histogram(TIME_BUCKETS)
+            hist.observe(seconds)
+            if failed:
+                self._stage_errors[name] = self._stage_errors.get(name, 0) + 1
+
+    def observe(self, kind, value):
+        """Record an input size such as pages, chars or tokens."""
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._sizes.get(kind)
+            if hist is None:
+                hist = self._sizes[kind] = Histogram(SIZE_BUCKETS)
+            hist.observe(value)
+
+    def inc(self, event, amount=1):
+        """Count an event such as a cache hit or miss."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + amount
+
+    # -------------------------------
+    # Export
+    # -------------------------------
+    def snapshot(self):
+        with self._lock:
+            return {
+                "stage_seconds": {k: h.to_dict() for k, h in self._stage_seconds.items()},
+                "stage_errors": dict(self._stage_errors),
+                "input_size": {k: h.to_dict() for k, h in self._sizes.items()},
+                "events": dict(self._events),
+            }
+
+    def _prometheus_histogram(self, lines, name, label, histograms, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for value, hist in sorted(histograms.items()):
+            cumulative = 0
+            for le, count in zip([*hist.buckets, "+Inf"], hist.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label}="{value}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}="{value}"}} {hist.sum}')
+            lines.append(f'{name}_count{{{label}="{value}"}} {hist.count}')
+
+    def to_prometheus(self):
+        """Prometheus text exposition format."""
+        p = self.prefix
+        lines = []
+        with self._lock:
+            self._prometheus_histogram(lines, f"{p}_stage_seconds", "stage", self._stage_seconds,
+                                       "Time spent in each pipeline stage.")
+            self._prometheus_histogram(lines, f"{p}_input_size", "kind", self._sizes,
+                                       "Input sizes (pages, chars, tokens) per resume.")
+            lines.append(f"# HELP {p}_stage_errors_total Exceptions raised inside a stage.")
+            lines.append(f"# TYPE {p}_stage_errors_total counter")
+            for stage, count in sorted(self._stage_errors.items()):
+                lines.append(f'{p}_stage_errors_total{{stage="{stage}"}} {count}')
+            lines.append(f"# HELP {p}_events_total Counted events such as cache hits and misses.")
+            lines.append(f"# TYPE {p}_events_total counter")
+            for event, count in sorted(self._events.items()):
+                lines.append(f'{p}_events_total{{event="{event}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write Prometheus text for ``*.prom`` paths and JSON otherwise, replacing the file atomically."""
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+metrics = Metrics(enabled=os.environ.get("RESUME_METRICS") == "1")
+
+# -------------------------------
+# Opt-in Profiling
+# -------------------------------
+@contextmanager
+def maybe_profile(name="request", rate=None, profile_dir=None):
+    """cProfile the enclosed block for a ``rate`` fraction of calls and save a .prof file.
+
+    cProfile only sees the calling thread, so wrap code that runs in one thread.
+    """
+    rate = PROFILE_RATE if rate is None else rate
+    if rate <= 0 or random.random() >= rate:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profile_dir = profile_dir or PROFILE_DIR
+        os.makedirs(profile_dir, exist_ok=True)
+        file_name = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}.prof"
+        profiler.dump_stats(os.path.join(profile_dir, file_name))
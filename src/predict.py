@@ -1,15 +1,73 @@
-import joblib
-from preprocess import clean_text
+import itertools
+import os
+
+import numpy as np
+
+from artifacts import registry
+from bundle import MANIFEST_PATH, load_classifier
+from screening import clean_text
+
+DEFAULT_BATCH_SIZE = 1024
+# "numpy" runs the bundle through src/inference.py instead of scikit-learn
+BACKEND = os.environ.get("RESUME_PREDICT_BACKEND", "sklearn")
 
 def load_artifacts():
-    model = joblib.load("models/resume_model.pkl")
-    tfidf = joblib.load("models/tfidf.pkl")
-    le = joblib.load("models/label_encoder.pkl")
-    return model, tfidf, le
+    # The bundle is written by src/train.py, which cleans text with the same rules as screening.clean_text.
+    # It is keyed on the manifest, which save_bundle writes last, so a retrain hot-reloads.
+    return registry.get(MANIFEST_PATH, load_classifier)
+
+def load_kernel():
+    from inference import InferenceKernel
+
+    return registry.get(MANIFEST_PATH, InferenceKernel.from_bundle)
+
+def _classifier(backend):
+    """``(classes, predict_proba)`` where ``predict_proba`` takes cleaned texts."""
+    if backend == "numpy":
+        kernel = load_kernel()
+        return kernel.classes, kernel.predict_proba
+    model, tfidf = load_artifacts()
+    return model.classes_, lambda texts: model.predict_proba(tfidf.transform(texts))
+
+def warm_up(backend=None):
+    _classifier(backend or BACKEND)
+
+def _top_k(proba, k):
+    # argpartition picks the k best columns in O(n_classes), then only those k get sorted
+    top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    top_proba = np.take_along_axis(proba, top, axis=1)
+    order = np.argsort(-top_proba, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_proba, order, axis=1)
+
+def predict_batch(texts, top_k=3, batch_size=DEFAULT_BATCH_SIZE, clean=True, backend=None):
+    """Predict the top-k categories for many resumes at once.
+
+    Texts are processed in micro-batches of ``batch_size``: each one is a single
+    ``tfidf.transform`` and a single sparse ``predict_proba`` call. Returns
+    ``(labels, probabilities)``, both of shape ``(n_texts, top_k)`` with the most
+    likely category first. Pass ``clean=False`` if the texts are already cleaned.
+    ``backend`` ("sklearn" or "numpy") defaults to ``RESUME_PREDICT_BACKEND``.
+    """
+    classes, predict_proba = _classifier(backend or BACKEND)
+    k = max(1, min(top_k, len(classes)))
+
+    labels, probabilities = [], []
+    texts = iter(texts)
+    while True:
+        batch = list(itertools.islice(texts, batch_size))
+        if not batch:
+            break
+        if clean:
+            batch = [clean_text(t) if isinstance(t, str) else "" for t in batch]
+        proba = predict_proba(batch)
+        top, top_proba = _top_k(proba, k)
+        labels.append(classes[top])
+        probabilities.append(top_proba)
+
+    if not labels:
+        return np.empty((0, k), dtype=classes.dtype), np.empty((0, k))
+    return np.vstack(labels), np.vstack(probabilities)
 
 def predict_resume(text):
-    model, tfidf, le = load_artifacts()
-    cleaned = clean_text(text)
-    vec = tfidf.transform([cleaned])
-    pred = model.predict(vec)[0]
-    return le.inverse_transform([pred])[0]
+    labels, _ = predict_batch([text], top_k=1)
+    return labels[0, 0]
@@ -0,0 +1,313 @@
+# src/resume_index.py
+# Rank stored resumes against a job description.
+#
+#   python src/resume_index.py build data/Resume.csv -o .cache/resume_index
+#   python src/resume_index.py query .cache/resume_index -q "python django rest api developer" -k 50
+#
+# Each resume is stored as its L2-normalized TF-IDF row (the model bundle's
+# vectorizer) plus a binary row of skills from the SkillMatcher. Rows live in
+# column-major (CSC) segments, so a column is the posting list of one term or
+# skill: a query only reads the postings of the terms it contains, one segment
+# at a time, and each segment contributes its top k via argpartition.
+# Each add() appends segments; once more than MAX_SMALL_SEGMENTS partial ones
+# pile up at the end they are merged, so an add only ever rewrites rows that
+# are not yet in a full segment.
+
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+from scipy import sparse
+
+from ingest import iter_batches
+from screening import clean_text
+
+INDEX_DIR = ".cache/resume_index"
+SEGMENT_SIZE = 50_000
+MAX_SMALL_SEGMENTS = 16  # trailing segments below segment_size before they are merged
+SKILL_WEIGHT = 0.3
+FORMAT_VERSION = 2
+
+
+class IndexMismatchError(ValueError):
+    pass
+
+
+def featurizer_version(vectorizer):
+    """Hash of the vectorizer's terms and idf; stored rows are only comparable under the same one."""
+    h = hashlib.sha256("\n".join(vectorizer.get_feature_names_out()).encode("utf-8"))
+    h.update(np.asarray(vectorizer.idf_, dtype=np.float64).tobytes())
+    return h.hexdigest()[:16]
+
+
+def skills_version(skill_matcher):
+    """Hash of the skill list in id order; the skill columns are those ids."""
+    return hashlib.sha256("\n".join(skill_matcher.skills).encode("utf-8")).hexdigest()[:16]
+
+
+class ResumeIndex:
+    def __init__(self, vectorizer, skill_matcher, segment_size=SEGMENT_SIZE):
+        self.vectorizer = vectorizer
+        self.skill_matcher = skill_matcher
+        self.segment_size = segment_size
+        self.n_terms = len(vectorizer.vocabulary_)
+        self.n_skills = len(skill_matcher)
+        self.versions = {"featurizer": featurizer_version(vectorizer), "skills": skills_version(skill_matcher)}
+        self.segments = []        # list of (tfidf_csc, skills_csc)
+        self.ids = []             # row -> resume id
+        self.deleted = np.zeros(0, dtype=bool)
+        self._rows = {}           # resume id -> row
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._rows
+
+    # -------------------------------
+    # 1. Featurization
+    # -------------------------------
+    def _skill_matrix(self, cleaned_texts):
+        rows, cols = [], []
+        for row, text in enumerate(cleaned_texts):
+            skill_ids = self.skill_matcher.match_ids(text)
+            rows.extend([row] * len(skill_ids))
+            cols.extend(skill_ids)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(cleaned_texts), self.n_skills),
+        )
+
+    def _featurize(self, texts, clean=True):
+        cleaned = [clean_text(t) if isinstance(t, str) else "" for t in texts] if clean else list(texts)
+        tfidf = self.vectorizer.transform(cleaned).astype(np.float32)
+        return tfidf, self._skill_matrix(cleaned)
+
+    # -------------------------------
+    # 2. Incremental Updates
+    # -------------------------------
+    def add(self, ids, texts, clean=True):
+        """Index resumes; an id that is already indexed, or repeated in ``ids``, is replaced by its last text."""
+        ids, texts = [str(i) for i in ids], list(texts)
+        last = {resume_id: i for i, resume_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids, texts = [ids[i] for i in keep], [texts[i] for i in keep]
+        self.delete([i for i in ids if i in self._rows])
+        tfidf, skills = self._featurize(texts, clean)
+        start = len(self.ids)
+        for offset in range(0, len(ids), self.segment_size):
+            stop = offset + self.segment_size
+            self.segments.append((tfidf[offset:stop].tocsc(), skills[offset:stop].tocsc()))
+        self.ids.extend(ids)
+        self._rows.update((resume_id, start + i) for i, resume_id in enumerate(ids))
+        self.deleted = np.concatenate([self.deleted, np.zeros(len(ids), dtype=bool)])
+        self._merge_tail()
+
+    def delete(self, ids):
+        for resume_id in ids:
+            row = self._rows.pop(str(resume_id), None)
+            if row is not None:
+                self.deleted[row] = True
+
+    def _merge_tail(self, max_small=MAX_SMALL_SEGMENTS):
+        """Merge the trailing segments smaller than segment_size once there are more than ``max_small``.
+
+        Full segments are left alone and row numbers do not change; deleted rows
+        stay until compact().
+        """
+        first = len(self.segments)
+        while first and self.segments[first - 1][0].shape[0] < self.segment_size:
+            first -= 1
+        if len(self.segments) - first <= max_small:
+            return
+        tail = self.segments[first:]
+        tfidf = sparse.vstack([s[0] for s in tail], format="csr")
+        skills = sparse.vstack([s[1] for s in tail], format="csr")
+        self.segments[first:] = [
+            (tfidf[i:i + self.segment_size].tocsc(), skills[i:i + self.segment_size].tocsc())
+            for i in range(0, tfidf.shape[0], self.segment_size)
+        ]
+
+    def compact(self):
+        """Drop deleted rows and rewrite the index as full-size segments."""
+        if not self.segments:
+            return
+        keep = np.flatnonzero(~self.deleted)
+        tfidf = sparse.vstack([s[0] for s in self.segments], format="csr")[keep]
+        skills = sparse.vstack([s[1] for s in self.segments], format="csr")[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self._rows = {resume_id: row for row, resume_id in enumerate(self.ids)}
+        self.deleted = np.zeros(len(self.ids), dtype=bool)
+        self.segments = [
+            (tfidf[i:i + self.segment_size].tocsc(), skills[i:i + self.segment_size].tocsc())
+            for i in range(0, len(self.ids), self.segment_size)
+        ]
+
+    # -------------------------------
+    # 3. Queries
+    # -------------------------------
+    def search(self, job_description, k=50, skill_weight=SKILL_WEIGHT):
+        """Top ``k`` resumes for a job description, best first.
+
+        score = (1 - skill_weight) * cosine(tfidf) + skill_weight * share of the
+        job's skills found in the resume. Returns dicts with the id and all three
+        numbers.
+        """
+        query_tfidf, query_skills = self._featurize([job_description])
+        term_cols, term_weights = query_tfidf.indices, query_tfidf.data
+        skill_cols = query_skills.indices
+        n_query_skills = max(len(skill_cols), 1)
+
+        candidates = []  # (scores, cosines, overlaps, rows) per segment
+        offset = 0
+        for tfidf, skills in self.segments:
+            n_rows = tfidf.shape[0]
+            cosine = tfidf[:, term_cols] @ term_weights if len(term_cols) else np.zeros(n_rows, np.float32)
+            overlap = (np.asarray(skills[:, skill_cols].sum(axis=1)).ravel() / n_query_skills
+                       if len(skill_cols) else np.zeros(n_rows, np.float32))
+            score = (1 - skill_weight) * cosine + skill_weight * overlap
+            score[self.deleted[offset:offset + n_rows]] = -np.inf
+            top = self._top(score, k)
+            candidates.append((score[top], cosine[top], overlap[top], top + offset))
+            offset += n_rows
+
+        if not candidates:
+            return []
+        scores, cosines, overlaps, rows = (np.concatenate(parts) for parts in zip(*candidates))
+        best = self._top(scores, k)
+        best = best[np.isfinite(scores[best])]
+        return [
+            {
+                "id": self.ids[rows[i]],
+                "score": round(float(scores[i]), 6),
+                "cosine": round(float(cosines[i]), 6),
+                "skill_overlap": round(float(overlaps[i]), 6),
+            }
+            for i in best
+        ]
+
+    @staticmethod
+    def _top(scores, k):
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    # -------------------------------
+    # 4. Persistence
+    # -------------------------------
+    def save(self, path=INDEX_DIR):
+        """Compact and write the index as .npz matrices plus an ids file."""
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        tfidf = sparse.vstack([s[0] for s in self.segments], format="csr") if self.segments else \
+            sparse.csr_matrix((0, self.n_terms), dtype=np.float32)
+        skills = sparse.vstack([s[1] for s in self.segments], format="csr") if self.segments else \
+            sparse.csr_matrix((0, self.n_skills), dtype=np.float32)
+        sparse.save_npz(os.path.join(path, "tfidf.npz"), tfidf)
+        sparse.save_npz(os.path.join(path, "skills.npz"), skills)
+        with open(os.path.join(path, "ids.json"), "w") as f:
+            json.dump(self.ids, f)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                "format_version": FORMAT_VERSION,
+                "documents": len(self.ids),
+                "n_terms": self.n_terms,
+                "n_skills": self.n_skills,
+                "segment_size": self.segment_size,
+                "featurizer_version": self.versions["featurizer"],
+                "skills_version": self.versions["skills"],
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, vectorizer, skill_matcher, path=INDEX_DIR):
+        """Open a saved index; raises IndexMismatchError if it was built with another featurizer.
+
+        A retrain can keep the number of terms but not which terms they are, so
+        the check is on content hashes of the vocabulary/idf and the skill list.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        index = cls(vectorizer, skill_matcher, meta["segment_size"])
+        stored = {"featurizer": meta.get("featurizer_version"), "skills": meta.get("skills_version")}
+        if meta.get("format_version") != FORMAT_VERSION or stored != index.versions:
+            raise IndexMismatchError(
+                f"Index at {path} was built with a different model vocabulary or skill dictionary; "
+                f"rebuild it with `python src/resume_index.py build <csv> -o {path} --rebuild`"
+            )
+        with open(os.path.join(path, "ids.json")) as f:
+            index.ids = json.load(f)
+        tfidf = sparse.load_npz(os.path.join(path, "tfidf.npz")).tocsr()
+        skills = sparse.load_npz(os.path.join(path, "skills.npz")).tocsr()
+        index.segments = [
+            (tfidf[i:i + index.segment_size].tocsc(), skills[i:i + index.segment_size].tocsc())
+            for i in range(0, len(index.ids), index.segment_size)
+        ]
+        index._rows = {resume_id: row for row, resume_id in enumerate(index.ids)}
+        index.deleted = np.zeros(len(index.ids), dtype=bool)
+        return index
+
+
+def open_index(path=INDEX_DIR, role_skills_path="src/role_skills.pkl", rebuild=False):
+    """Load the index at ``path`` (or an empty one) with the shared vectorizer and skill matcher.
+
+    With ``rebuild`` an existing index is ignored and an empty one returned.
+    """
+    from artifacts import registry
+    from predict import load_artifacts
+    from skill_matcher import SkillMatcher
+
+    _, vectorizer = load_artifacts()
+    skill_matcher = registry.get(role_skills_path, SkillMatcher.from_pickles)
+    if not rebuild and os.path.exists(os.path.join(path, "meta.json")):
+        return ResumeIndex.load(vectorizer, skill_matcher, path)
+    return ResumeIndex(vectorizer, skill_matcher)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the resume ranking index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser(
+        "build",
+        help="Add every row of a Resume.csv-shaped CSV or Parquet file to the index. Rows are keyed "
+             "'<file name>:<row>', so building from the same file again replaces its rows",
+    )
+    build.add_argument("csv")
+    build.add_argument("-o", "--index", default=INDEX_DIR)
+    build.add_argument("--rebuild", action="store_true",
+                       help="Start from an empty index, e.g. after retraining the model")
+    build.add_argument("--chunk-size", type=int, default=5000)
+    query = sub.add_parser("query", help="Top resumes for a job description")
+    query.add_argument("index", nargs="?", default=INDEX_DIR)
+    query.add_argument("-q", "--job-description", required=True, help="Job description text, or @file to read it")
+    query.add_argument("-k", type=int, default=50)
+    query.add_argument("--skill-weight", type=float, default=SKILL_WEIGHT)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = open_index(args.index, rebuild=args.rebuild)
+        source = os.path.basename(args.csv)
+        row_id = 0
+        for chunk in iter_batches(args.csv, ["Resume"], args.chunk_size):
+            ids = [f"{source}:{i}" for i in range(row_id, row_id + len(chunk))]
+            index.add(ids, chunk["Resume"].tolist())
+            row_id += len(chunk)
+        index.save(args.index)
+        print(f"✅ Indexed {len(index)} resumes in {args.index}")
+    else:
+        job_description = args.job_description
+        if job_description.startswith("@"):
+            with open(job_description[1:], encoding="utf-8") as f:
+                job_description = f.read()
+        index = open_index(args.index)
+        for rank, hit in enumerate(index.search(job_description, args.k, args.skill_weight), 1):
+            print(f"{rank:>3}. {hit['id']:<12} score={hit['score']:.4f} "
+                  f"cosine={hit['cosine']:.4f} skills={hit['skill_overlap']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# src/role_scoring.py
+
+import pickle
+
+import numpy as np
+from scipy import sparse
+
+
+class RoleScorer:
+    """Scores resumes against roles with a sparse role x skill incidence matrix.
+
+    The matrix is built once from the role -> skills dictionary. Match counts for
+    every role come from a single sparse product, and the top roles are picked
+    with ``argpartition``; ties keep the dictionary order of the roles, as the
+    old sorted() based ranking did.
+    """
+
+    def __init__(self, role_skills):
+        self.roles = list(role_skills.keys())
+        self.skills = []
+        self.skill_index = {}
+        rows, cols = [], []
+        for role_id, role in enumerate(self.roles):
+            seen = set()
+            for skill in role_skills[role]:
+                skill = skill.lower()
+                if skill in seen:
+                    continue
+                seen.add(skill)
+                col = self.skill_index.get(skill)
+                if col is None:
+                    col = self.skill_index[skill] = len(self.skills)
+                    self.skills.append(skill)
+                rows.append(role_id)
+                cols.append(col)
+        self.incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(self.roles), len(self.skills)),
+        )
+        self.role_sizes = np.diff(self.incidence.indptr)
+
+    @classmethod
+    def from_pickle(cls, path):
+        with open(path, "rb") as f:
+            return cls(pickle.load(f))
+
+    # -------------------------------
+    # Scoring
+    # -------------------------------
+    def skill_vector(self, skills_found):
+        vec = np.zeros(len(self.skills), dtype=np.float32)
+        cols = [self.skill_index[s] for s in skills_found if s in self.skill_index]
+        vec[cols] = 1
+        return vec
+
+    def score(self, skills_found):
+        """Return ``(match_counts, match_percents)`` for every role, in role order."""
+        counts = self.incidence @ self.skill_vector(skills_found)
+        percents = 100 * counts / np.maximum(self.role_sizes, 1)
+        return counts, percents
+
+    def score_many(self, skill_lists):
+        """Match counts for many resumes at once, shape ``(n_resumes, n_roles)``."""
+        rows, cols = [], []
+        for row, skills_found in enumerate(skill_lists):
+            found = {self.skill_index[s] for s in skills_found if s in self.skill_index}
+            rows.extend([row] * len(found))
+            cols.extend(found)
+        found = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(skill_lists), len(self.skills)),
+        )
+        return (found @ self.incidence.T).toarray()
+
+    def top_k(self, scores, k):
+        """Indices of the ``k`` highest scores, best first, ties broken by role order."""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        # Scores are rank-transformed so each key is unique: higher score first, then lower index
+        ranks = np.unique(scores, return_inverse=True)[1]
+        keys = ranks.astype(np.int64) * len(scores) + (len(scores) - 1 - np.arange(len(scores)))
+        top = np.argpartition(-keys, k - 1)[:k]
+        return top[np.argsort(-keys[top])]
+
+    def missing_skills(self, role_id, skill_vector):
+        start, end = self.incidence.indptr[role_id], self.incidence.indptr[role_id + 1]
+        cols = self.incidence.indices[start:end]
+        return [self.skills[c] for c in cols[skill_vector[cols] == 0]]
+
+    def predict_role(self, skills_found, counts=None, n_secondary=2):
+        """Best role, its missing skills, and missing skills for the next ``n_secondary`` roles.
+
+        Pass ``counts`` from a previous ``score`` call to avoid scoring twice.
+        """
+        vec = self.skill_vector(skills_found)
+        if counts is None:
+            counts = self.incidence @ vec
+        top = self.top_k(counts, 1 + n_secondary)
+        best_role = self.roles[top[0]]
+        best_role_skills_to_master = self.missing_skills(top[0], vec)
+        secondary_roles_suggestions = {
+            self.roles[role_id]: self.missing_skills(role_id, vec) for role_id in top[1:]
+        }
+        return best_role, best_role_skills_to_master, secondary_roles_suggestions
@@ -0,0 +1,24 @@
+# src/screening.py
+# Resume screening pipeline shared by app.py and src/batch.py.
+# Text extraction lives in extraction.extract, role prediction in
+# role_scoring.RoleScorer, ATS scoring in ats.ATSScorer.
+
+import re
+
+# -------------------------------
+# 1. Clean Text
+# -------------------------------
+_URL = re.compile(r"http\S+")
+_NON_LETTERS = re.compile(r"[^a-zA-Z]+")
+
+
+def clean_text(text):
+    # Non-letters go before lowercasing: some of them ("İ") lower to ASCII letters
+    return " ".join(_NON_LETTERS.sub(" ", _URL.sub("", text)).lower().split())
+
+# -------------------------------
+# 2. Skill Extraction
+# -------------------------------
+def extract_skills(text, skill_matcher):
+    skills_found, _ = skill_matcher.match(text)
+    return skills_found
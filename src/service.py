@@ -0,0 +1,282 @@
+# src/service.py
+# Headless scoring API.
+#
+#   python src/service.py --port 8000
+#   curl -F file=@resume.pdf localhost:8000/score
+#   curl -H 'Content-Type: application/json' -d '{"text": "..."}' localhost:8000/score
+#
+# Concurrent requests are grouped into micro-batches so the vectorizer and model
+# run once per batch instead of once per request.
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import tornado.web
+
+from artifacts import registry
+from ats import ATSScorer
+from extraction import EXTENSION_TYPES, MAX_BYTES, ExtractionError, FileTooLargeError, extract
+from metrics import metrics, maybe_profile
+from predict import predict_batch, warm_up
+from role_scoring import RoleScorer
+from screening import clean_text, extract_skills
+from skill_matcher import SkillMatcher
+
+ROLE_SKILLS_PATH = "src/role_skills.pkl"
+MAX_BATCH_SIZE = 32
+MAX_WAIT_MS = 5.0
+TOP_K = 3
+
+# -------------------------------
+# 1. Dynamic Micro-batching
+# -------------------------------
+class MicroBatcher:
+    """Collects concurrent ``submit`` calls into batches for ``batch_fn``.
+
+    A batch is dispatched once it holds ``max_batch_size`` items or ``max_wait_ms``
+    after its first item arrived, whichever comes first. ``batch_fn`` takes a
+    list of items, returns a list of results in the same order, and runs in
+    ``executor`` so the event loop keeps accepting requests meanwhile. If it
+    raises or returns the wrong number of results, every item of the batch fails.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, executor=None):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self.stats = {"batches": 0, "items": 0, "max_batch": 0}
+        self._queue = None
+        self._task = None
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(items))
+            try:
+                results = list(await loop.run_in_executor(self.executor, self.batch_fn, items))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                # Every caller of the batch gets the error; none is left waiting
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+# -------------------------------
+# 2. Scoring
+# -------------------------------
+def predict_categories(cleaned_texts, top_k=TOP_K):
+    metrics.observe("batch_size", len(cleaned_texts))
+    with metrics.stage("predict_batch"):
+        labels, probabilities = predict_batch(cleaned_texts, top_k=top_k, clean=False)
+    return [
+        [{"category": str(label), "probability": round(float(p), 4)} for label, p in zip(row_labels, row_probs)]
+        for row_labels, row_probs in zip(labels, probabilities)
+    ]
+
+
+class ResumeScorer:
+    def __init__(self, role_skills_path=ROLE_SKILLS_PATH, max_batch_size=MAX_BATCH_SIZE,
+                 max_wait_ms=MAX_WAIT_MS, workers=None):
+        self.role_skills_path = role_skills_path
+        self.executor = ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) + 4))
+        self.batcher = MicroBatcher(predict_categories, max_batch_size, max_wait_ms, self.executor)
+
+    def warm_up(self):
+        warm_up()
+        registry.warm_up(self.role_skills_path, loader=ATSScorer.from_pickle)
+        registry.warm_up(self.role_skills_path, loader=SkillMatcher.from_pickles)
+        registry.warm_up(self.role_skills_path, loader=RoleScorer.from_pickle)
+
+    def _screen(self, text):
+        ats_scorer = registry.get(self.role_skills_path, ATSScorer.from_pickle)
+        skill_matcher = registry.get(self.role_skills_path, SkillMatcher.from_pickles)
+        role_scorer = registry.get(self.role_skills_path, RoleScorer.from_pickle)
+
+        with maybe_profile("score"):
+            with metrics.stage("clean"):
+                cleaned = clean_text(text)
+            with metrics.stage("skills"):
+                skills_found = extract_skills(cleaned, skill_matcher)
+            with metrics.stage("role"):
+                counts, percents = role_scorer.score(skills_found)
+                best_role, skills_to_master, secondary = role_scorer.predict_role(skills_found, counts)
+            with metrics.stage("ats"):
+                ats = ats_scorer.explain(text, skills_found)
+        if metrics.enabled:
+            metrics.observe("chars", len(text))
+            metrics.observe("tokens", cleaned.count(" ") + 1 if cleaned else 0)
+        return cleaned, {
+            "best_role": best_role,
+            "role_match_percent": {
+                role_scorer.roles[i]: round(float(percents[i]), 2) for i in role_scorer.top_k(percents, 6)
+            },
+            "skills": skills_found,
+            "skills_to_master": skills_to_master,
+            "secondary_roles": secondary,
+            "ats_score": ats["score"],
+            "ats_rules": ats["rules"],
+        }
+
+    def _extract(self, data, file_type):
+        with metrics.stage("extract"):
+            extracted = extract(data, file_type)
+        metrics.observe("bytes", len(data))
+        metrics.observe("pages", extracted.pages)
+        return extracted
+
+    async def extract(self, data, file_type):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._extract, data, file_type)
+
+    async def score(self, text):
+        loop = asyncio.get_running_loop()
+        cleaned, result = await loop.run_in_executor(self.executor, self._screen, text)
+        result["predicted_categories"] = await self.batcher.submit(cleaned)
+        return result
+
+    def close(self):
+        self.batcher.close()
+        self.executor.shutdown(wait=False)
+
+# -------------------------------
+# 3. HTTP Handlers
+# -------------------------------
+class ScoreHandler(tornado.web.RequestHandler):
+    def initialize(self, scorer):
+        self.scorer = scorer
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({"error": self._reason})
+
+    async def post(self):
+        uploads = self.request.files.get("file")
+        content_type = self.request.headers.get("Content-Type", "")
+        truncated = False
+        if uploads:
+            upload = uploads[0]
+            file_type = upload["content_type"]
+            if file_type not in EXTENSION_TYPES.values():
+                file_type = EXTENSION_TYPES.get(os.path.splitext(upload["filename"])[1].lower())
+            if file_type is None:
+                raise tornado.web.HTTPError(415, reason="Upload a PDF, DOCX or TXT resume")
+            try:
+                extracted = await self.scorer.extract(upload["body"], file_type)
+            except FileTooLargeError as e:
+                raise tornado.web.HTTPError(413, reason=str(e))
+            except ExtractionError as e:
+                raise tornado.web.HTTPError(422, reason=str(e))
+            text, truncated = extracted.text, extracted.truncated
+        elif content_type.startswith("application/json"):
+            try:
+                text = json.loads(self.request.body)["text"]
+            except (ValueError, KeyError, TypeError):
+                raise tornado.web.HTTPError(400, reason='Expected a JSON body like {"text": "..."}')
+        else:
+            text = self.request.body.decode("utf-8", errors="replace")
+
+        if not isinstance(text, str) or not text.strip():
+            raise tornado.web.HTTPError(400, reason="No resume text found")
+        with metrics.stage("request"):
+            result = await self.scorer.score(text)
+        result["truncated"] = truncated
+        self.write(result)
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.write(metrics.to_prometheus())
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def initialize(self, scorer):
+        self.scorer = scorer
+
+    def get(self):
+        self.write({"status": "ok", "batching": self.scorer.batcher.stats})
+
+
+def make_app(scorer=None):
+    """Tornado application; tests can drive it with tornado.testing.AsyncHTTPTestCase."""
+    scorer = scorer or ResumeScorer()
+    return tornado.web.Application([
+        (r"/score", ScoreHandler, {"scorer": scorer}),
+        (r"/health", HealthHandler, {"scorer": scorer}),
+        (r"/metrics", MetricsHandler),
+    ])
+
+
+async def serve(port, scorer):
+    scorer.warm_up()
+    # Leave headroom over the extraction limit for multipart framing
+    make_app(scorer).listen(port, max_body_size=MAX_BYTES + 64 * 1024)
+    print(f"✅ Scoring service listening on http://localhost:{port}/score")
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume scoring over HTTP.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--role-skills", default=ROLE_SKILLS_PATH)
+    args = parser.parse_args(argv)
+
+    scorer = ResumeScorer(args.role_skills, args.max_batch_size, args.max_wait_ms)
+    try:
+        asyncio.run(serve(args.port, scorer))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scorer.close()
+
+
+if __name__ == "__main__":
+    main()
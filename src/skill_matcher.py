@@ -0,0 +1,287 @@
+# src/skill_matcher.py
+
+import os
+import pickle
+import re
+
+_NON_ALPHA = re.compile(r"[^a-z]+")
+KNOWN_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.pkl")
+
+# Alternative spellings -> the skill as written in role_skills.pkl. Keys go
+# through the same tokenizer as resume text, so "node.js", "node js" and
+# "Node-JS" are one entry, and digits drop out ("k8s" -> "k s") as they do in
+# clean_text. Aliases whose skill is not in the dictionary are ignored.
+# Misspellings common enough to be in src/skills.pkl are listed here too, since
+# fuzzy matching trusts every word in that file.
+ALIASES = {
+    "amazon web services": "aws",
+    "auto cad": "autocad",
+    "cicd": "ci/cd",
+    "continuous integration": "ci/cd",
+    "data warehouse": "data warehousing",
+    "ecmascript": "javascript",
+    "excell": "excel",
+    "k8s": "kubernetes",
+    "microsoft excel": "excel",
+    "ms excel": "excel",
+    "my sql": "mysql",
+    "node js": "nodejs",
+    "object oriented programming": "oop",
+    "pen testing": "penetration testing",
+    "pentesting": "penetration testing",
+    "phython": "python",
+    "postgres": "postgresql",
+    "postgressql": "postgresql",
+    "postgre sql": "postgresql",
+    "powerbi": "power bi",
+    "react js": "react",
+    "reactjs": "react",
+    "recruiting": "recruitment",
+    "rest api": "api development",
+    "restful api": "api development",
+    "sklearn": "scikit-learn",
+    "smart contract": "smart contracts",
+    "solid works": "solidworks",
+    "spring boot": "spring",
+    "springboot": "spring",
+    "sprinng": "spring",
+    "test case": "test cases",
+    "ui ux": "ux/ui design",
+    "ux design": "ux/ui design",
+}
+
+# Typo tolerance: tokens of at least FUZZY_MIN_LENGTH letters may be up to
+# 1 edit (2 from FUZZY_LONG_LENGTH letters) away from a word of some skill.
+# Below FUZZY_LONG_LENGTH a substituted letter is not accepted: it is how one
+# real word turns into another ("sprint"/"spring", "reach"/"react").
+FUZZY_MIN_LENGTH = 5
+FUZZY_LONG_LENGTH = 9
+MAX_CORRECTIONS = 100_000
+
+
+def tokenize(text):
+    """Lowercase ``text`` and split it into alphabetic tokens (same rules as app.clean_text)."""
+    return _NON_ALPHA.sub(" ", text.lower()).split()
+
+
+def normalize_skill(skill):
+    """Token tuple used as the index key for a skill, e.g. 'ci/cd' -> ('ci', 'cd')."""
+    return tuple(tokenize(skill))
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent swaps cost 1), or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class FuzzyIndex:
+    """SymSpell-style deletion index: a word and every string within
+    ``max_distance`` deletions of it map back to the word.
+
+    A lookup generates the query's own deletions and checks candidates with
+    ``edit_distance``, so its cost depends on the query length and not on how
+    many words are indexed.
+    """
+
+    def __init__(self, max_distance=2):
+        self.max_distance = max_distance
+        self.words = set()
+        self._deletes = {}
+
+    @staticmethod
+    def _variants(word, max_distance):
+        variants, frontier = {word}, {word}
+        for _ in range(max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def add(self, word):
+        if word in self.words:
+            return
+        self.words.add(word)
+        for variant in self._variants(word, self.max_distance):
+            self._deletes.setdefault(variant, []).append(word)
+
+    def lookup(self, word, max_distance):
+        """The single closest word within ``max_distance``; None if there is none or it is a tie."""
+        best, best_distance, tie = None, max_distance + 1, False
+        seen = set()
+        for variant in self._variants(word, min(max_distance, self.max_distance)):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, max_distance)
+                if distance < best_distance:
+                    best, best_distance, tie = candidate, distance, False
+                elif distance == best_distance:
+                    tie = True
+        return None if tie else best
+
+
+class SkillMatcher:
+    """Token n-gram hash index over a role -> skills dictionary.
+
+    The index is built once. ``match`` walks the text a single time and only
+    extends an n-gram while it is still the prefix of some known skill, so the
+    cost depends on the text length and the longest skill phrase, not on how
+    many skills are in the dictionary. Matching is on whole tokens, so 'java'
+    does not fire inside 'javascript'.
+
+    Aliases ('postgres', 'k8s') are extra keys for the same skill id. With
+    ``fuzzy`` on, a token that is neither a skill word nor in ``known_words``
+    is looked up once in a FuzzyIndex of skill words ('sckit' -> 'scikit') and
+    the answer is memoized, so matching stays linear in the number of tokens.
+    ``known_words`` (resume vocabulary, e.g. src/skills.pkl) keeps correctly
+    spelled words from being "corrected" into a nearby skill.
+    """
+
+    def __init__(self, role_skills=None, aliases=None, known_words=(), fuzzy=True):
+        self.roles = []          # role id -> role name
+        self.skills = []         # skill id -> skill name as written in the dictionary
+        self.skill_roles = []    # skill id -> list of role ids
+        self._role_ids = {}
+        self._index = {}         # token tuple -> skill id (skills and aliases)
+        self._prefixes = set()   # token tuples that start a longer skill
+        self.fuzzy = FuzzyIndex() if fuzzy else None
+        self._vocabulary = set(known_words)  # tokens taken as spelled correctly
+        self._corrections = {}   # token -> skill word it was corrected to (or itself)
+        if role_skills:
+            self.update(role_skills)
+        if aliases:
+            self.add_aliases(aliases)
+
+    @classmethod
+    def from_pickles(cls, *paths, aliases=ALIASES, known_words_path=KNOWN_WORDS_PATH, fuzzy=True):
+        """Build a matcher from one or more pickled role -> skills dictionaries.
+
+        The words in ``known_words_path`` (a pickled category -> words
+        dictionary) are only used to guard fuzzy matching, not as skills.
+        """
+        known_words = set()
+        if fuzzy and known_words_path and os.path.exists(known_words_path):
+            with open(known_words_path, "rb") as f:
+                for words in pickle.load(f).values():
+                    known_words.update(w for word in words for w in tokenize(word))
+        matcher = cls(known_words=known_words, fuzzy=fuzzy)
+        for path in paths:
+            with open(path, "rb") as f:
+                matcher.update(pickle.load(f))
+        if aliases:
+            matcher.add_aliases(aliases)
+        return matcher
+
+    def update(self, role_skills):
+        for role, skills in role_skills.items():
+            for skill in skills:
+                self.add(role, skill)
+
+    def _add_key(self, key, skill_id):
+        self._index[key] = skill_id
+        for n in range(1, len(key)):
+            self._prefixes.add(key[:n])
+        for token in key:
+            self._vocabulary.add(token)
+            if self.fuzzy is not None and len(token) >= FUZZY_MIN_LENGTH:
+                self.fuzzy.add(token)
+        self._corrections.clear()
+
+    def add(self, role, skill):
+        role_id = self._role_ids.get(role)
+        if role_id is None:
+            role_id = self._role_ids[role] = len(self.roles)
+            self.roles.append(role)
+
+        key = normalize_skill(skill)
+        if not key:
+            return
+        skill_id = self._index.get(key)
+        if skill_id is None:
+            skill_id = len(self.skills)
+            self.skills.append(skill.lower())
+            self.skill_roles.append([])
+            self._add_key(key, skill_id)
+        if role_id not in self.skill_roles[skill_id]:
+            self.skill_roles[skill_id].append(role_id)
+
+    def add_alias(self, alias, skill):
+        """Make ``alias`` match ``skill``; returns False if ``skill`` is not in the dictionary."""
+        skill_id = self._index.get(normalize_skill(skill))
+        key = normalize_skill(alias)
+        if skill_id is None or not key:
+            return False
+        if key not in self._index:
+            self._add_key(key, skill_id)
+        return True
+
+    def add_aliases(self, aliases):
+        for alias, skill in aliases.items():
+            self.add_alias(alias, skill)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def correct(self, token):
+        """``token``, or the skill word it is a likely typo of."""
+        corrected = self._corrections.get(token)
+        if corrected is None:
+            corrected = token
+            if self.fuzzy is not None and len(token) >= FUZZY_MIN_LENGTH and token not in self._vocabulary:
+                long_token = len(token) >= FUZZY_LONG_LENGTH
+                candidate = self.fuzzy.lookup(token, 2 if long_token else 1)
+                if candidate and (long_token or len(candidate) != len(token) or sorted(candidate) == sorted(token)):
+                    corrected = candidate
+            if len(self._corrections) >= MAX_CORRECTIONS:
+                self._corrections.clear()
+            self._corrections[token] = corrected
+        return corrected
+
+    def match_ids(self, text):
+        """Return skill ids found in ``text`` in order of first occurrence."""
+        tokens = tokenize(text)
+        if self.fuzzy is not None:
+            # Set difference runs in C; most resumes have few unknown tokens and fewer typos
+            corrections = {t: c for t in set(tokens) - self._vocabulary if (c := self.correct(t)) != t}
+            if corrections:
+                tokens = [corrections.get(t, t) for t in tokens]
+        index, prefixes = self._index, self._prefixes
+        found = {}
+        n_tokens = len(tokens)
+        for i in range(n_tokens):
+            key = (tokens[i],)
+            j = i + 1
+            while True:
+                skill_id = index.get(key)
+                if skill_id is not None:
+                    found[skill_id] = None
+                if j >= n_tokens or key not in prefixes:
+                    break
+                key += (tokens[j],)
+                j += 1
+        return list(found)
+
+    def match(self, text):
+        """Return ``(skills, role_ids)`` for every skill found in ``text``.
+
+        ``role_ids`` are indices into ``self.roles`` of roles that list at least
+        one of the matched skills.
+        """
+        skill_ids = self.match_ids(text)
+        role_ids = set()
+        for skill_id in skill_ids:
+            role_ids.update(self.skill_roles[skill_id])
+        return [self.skills[i] for i in skill_ids], sorted(role_ids)
@@ -0,0 +1,124 @@
+# src/startup.py
+# Cold-start report for the Streamlit app.
+#
+#   python src/startup.py                        # import-time table for app.py
+#   python src/startup.py -o startup.json        # ... and save it to track over time
+#   python src/startup.py --baseline startup.json
+#
+# Runs the script in a fresh interpreter under `python -X importtime` (Streamlit
+# "bare" mode: widgets return their defaults, nothing is uploaded) and sums the
+# self time of every imported module under its top-level package. Modules that
+# app.py defers (pandas, altair, SciPy, PyMuPDF) only show up here if
+# something pulls them onto the startup path again. The background artifact
+# thread imports in the same process, so everything pulled in by a top-level
+# import of scikit-learn or SciPy is reported separately as background time.
+#
+# Inside the running app the same phases are recorded as metrics stages:
+# startup_imports, startup_render and startup_artifacts (see src/metrics.py).
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+BACKGROUND_PACKAGES = ("sklearn", "scipy", "joblib", "threadpoolctl")
+SCRIPT = "app.py"
+
+# -------------------------------
+# 1. Measurement
+# -------------------------------
+def parse_importtime(stderr):
+    """``[(module, self_us, cumulative_us, depth), ...]`` in the order imports finished."""
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m[4], int(m[1]), int(m[2]), (len(m[3]) - 1) // 2))
+    return rows
+
+
+def measure(script=SCRIPT, python=sys.executable):
+    """Run ``script`` once in a fresh interpreter; returns wall time and per-package import times."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", script], capture_output=True, text=True, env=env)
+    wall = time.perf_counter() - start
+    rows = parse_importtime(proc.stderr)
+
+    # importtime lists a module after everything it imported, so each run of
+    # rows belongs to the next depth-0 import that follows it
+    packages, background, pending = {}, {}, []
+    for module, self_us, _, depth in rows:
+        pending.append((module, self_us))
+        if depth == 0:
+            target = background if module.split(".")[0] in BACKGROUND_PACKAGES else packages
+            for name, us in pending:
+                top = name.split(".")[0]
+                target[top] = target.get(top, 0) + us
+            pending = []
+    return {
+        "script": script,
+        "returncode": proc.returncode,
+        "wall_ms": round(1000 * wall, 1),
+        "import_ms": round(sum(packages.values()) / 1000, 1),
+        "background_import_ms": round(sum(background.values()) / 1000, 1),
+        "modules": len(rows),
+        "packages_ms": {
+            p: round(us / 1000, 1) for p, us in sorted(packages.items(), key=lambda kv: -kv[1])
+        },
+        "background_packages_ms": {
+            p: round(us / 1000, 1) for p, us in sorted(background.items(), key=lambda kv: -kv[1])
+        },
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+# -------------------------------
+# 2. Report
+# -------------------------------
+def format_report(report, top=15, baseline=None):
+    lines = [
+        f"{report['script']}: {report['wall_ms']:.0f} ms wall, {report['import_ms']:.0f} ms importing "
+        f"{report['modules']} modules (+{report['background_import_ms']:.0f} ms on the artifact thread)",
+        f"\n{'package':<28} {'self ms':>10}" + (f" {'base ms':>10}" if baseline else ""),
+    ]
+    base_packages = (baseline or {}).get("packages_ms", {})
+    for package, ms in list(report["packages_ms"].items())[:top]:
+        line = f"{package:<28} {ms:>10.1f}"
+        if baseline:
+            line += f" {base_packages.get(package, 0):>10.1f}"
+        lines.append(line)
+    if baseline:
+        lines.append(f"\nwall {baseline['wall_ms']:.0f} -> {report['wall_ms']:.0f} ms, "
+                     f"imports {baseline['import_ms']:.0f} -> {report['import_ms']:.0f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report where the app's cold start time goes.")
+    parser.add_argument("script", nargs="?", default=SCRIPT)
+    parser.add_argument("-o", "--output", help="Write the report as JSON to this file")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs; the fastest is reported")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = min((measure(args.script) for _ in range(args.repeat)), key=lambda r: r["wall_ms"])
+    if report["returncode"] != 0:
+        print(f"⚠  {args.script} exited with status {report['returncode']}", file=sys.stderr)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_report(report, args.top, baseline))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,58 @@
 # src/train.py
+#
+#   python src/train.py                          # same model as before, cached stages
+#   python src/train.py --search grid --n-jobs 8 # hyperparameter search first
+#   python src/train.py --no-cache               # recompute every stage
+#   python src/train.py --dedupe                 # drop near-duplicate resumes before splitting
+#   python src/train.py --dtype float64          # keep full-precision arrays in the bundle
 
-import pandas as pd
-import re
-import string
+import argparse
+import hashlib
+import json
+import os
 import pickle
-from sklearn.model_selection import train_test_split
+import time
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split, GridSearchCV, RandomizedSearchCV
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, accuracy_score
+from sklearn.pipeline import Pipeline
 
-# -------------------------------
-# 1. Load Dataset
-# -------------------------------
-# Ensure the dataset is placed in `data/Resume.csv`
-df = pd.read_csv("data/Resume.csv")
+from bundle import BUNDLE_DIR, save_bundle
+from dedup import THRESHOLD, find_duplicates
+from ingest import CHUNK_SIZE, CLEANED_COLUMN, clean_to_parquet, fit_tfidf, iter_column, read_column, transform_column
+from screening import clean_text as _clean_text
+
+DATA_PATH = "data/Resume.csv"
+CACHE_DIR = ".cache/train"
+ROLE_SKILLS_PATH = "src/role_skills.pkl"
+CACHE_VERSION = 1  # bump when clean_resume changes so cached corpora are rebuilt
 
-# Dataset usually has 'Category' (target) and 'Resume' (text)
-print("Dataset Shape:", df.shape)
-print("Categories:", df['Category'].unique())
+# Bundle arrays are exported as float32: half the size, and probabilities stay within ~1e-6 of
+# float64 (python src/inference.py validate --reference <float64 bundle> checks this)
+BUNDLE_DTYPE = "float32"
+
+# Train/test split; incremental.py rebuilds the same test rows to score the bundle on unseen resumes
+TEST_SIZE = 0.2
+SPLIT_SEED = 42
+
+VECTORIZER_PARAMS = {"max_features": 5000, "stop_words": "english", "ngram_range": (1, 2)}
+MODEL_PARAMS = {"max_iter": 2000}
+
+SEARCH_SPACE = {
+    "tfidf__max_features": [5000, 10000, 20000],
+    "tfidf__ngram_range": [(1, 1), (1, 2)],
+    "tfidf__sublinear_tf": [False, True],
+    "clf__C": [0.5, 1.0, 2.0, 5.0, 10.0],
+}
 
 # -------------------------------
-# 2. Predefined Skills List
+# 1. Predefined Skills List
 # -------------------------------
 # This dictionary is populated based on Gaurav Dutta Kaggle dataset
 # For each role, we define a set of relevant skills
@@ -50,65 +82,216 @@ role_skills = {
     "SAP Developer": ["sap abap", "sap modules", "integration", "sql", "business processes"]
 }
 
-# Save role_skills for app.py
-with open("src/role_skills.pkl", "wb") as f:
-    pickle.dump(role_skills, f)
-
-print("✅ Role-Skills dictionary saved successfully in src/role_skills.pkl")
-
 # -------------------------------
-# 3. Text Cleaning Function
+# 2. Stage Timing and Caching
 # -------------------------------
-def clean_text(text):
-    text = str(text)
-    text = re.sub(r"http\S+", "", text)                # remove URLs
-    text = re.sub(r"[^a-zA-Z ]", " ", text)           # remove numbers/special chars
-    text = text.lower()                                # lowercase
-    text = text.translate(str.maketrans("", "", string.punctuation))
-    text = re.sub(r"\s+", " ", text)                  # remove extra spaces
-    return text.strip()
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
 
-df["Cleaned_Resume"] = df["Resume"].apply(clean_text)
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
 
-# -------------------------------
-# 4. Train-Test Split
-# -------------------------------
-X = df["Cleaned_Resume"]
-y = df["Category"]
+    def report(self):
+        total = sum(self.stages.values())
+        lines = ["\n⏱  Stage timings:"]
+        for name, seconds in self.stages.items():
+            lines.append(f"  {name:<12} {seconds:8.2f}s")
+        lines.append(f"  {'total':<12} {total:8.2f}s")
+        return "\n".join(lines)
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42, stratify=y
-)
 
-# -------------------------------
-# 5. Vectorization
-# -------------------------------
-vectorizer = TfidfVectorizer(
-    max_features=5000, stop_words="english", ngram_range=(1,2)
-)
-X_train_vec = vectorizer.fit_transform(X_train)
-X_test_vec = vectorizer.transform(X_test)
+def file_hash(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def params_hash(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def cached(name, key, build, use_cache=True, cache_dir=CACHE_DIR):
+    """Return the pickled result of ``build()`` for ``key``, computing and storing it on a miss."""
+    path = os.path.join(cache_dir, f"{name}-{key[:16]}.pkl")
+    if use_cache and os.path.exists(path):
+        with open(path, "rb") as f:
+            print(f"↺  {name}: reusing {path}")
+            return pickle.load(f)
+    value = build()
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return value
 
 # -------------------------------
-# 6. Model Training
+# 3. Text Cleaning
 # -------------------------------
-model = LogisticRegression(max_iter=2000)
-model.fit(X_train_vec, y_train)
+def clean_resume(text):
+    # Same rules as screening.clean_text, which predict.py uses at inference time
+    return _clean_text(str(text))
+
+
+def split_rows(rows, labels):
+    """``(train_rows, test_rows, y_train, y_test)``: the stratified split the bundle is trained on."""
+    return train_test_split(rows, labels[rows], test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=labels[rows])
+
+
+def resolve_n_jobs(n_jobs):
+    return (os.cpu_count() or 1) if n_jobs is None or n_jobs < 1 else n_jobs
+
+
+def cleaned_corpus(data_path, key, n_jobs=1, chunk_size=CHUNK_SIZE, use_cache=True, cache_dir=CACHE_DIR):
+    """Path of the cleaned Parquet corpus for ``data_path``, streaming the CSV into it on a miss.
+
+    Later stages read single columns back from it, so the raw and cleaned text of
+    the whole dataset are never in memory together. It is written even without
+    the cache because those stages stream from it.
+    """
+    path = os.path.join(cache_dir, f"cleaned-{key[:16]}.parquet")
+    if use_cache and os.path.exists(path):
+        print(f"↺  cleaned: reusing {path}")
+        return path
+    os.makedirs(cache_dir, exist_ok=True)
+    clean_to_parquet(data_path, path, batch_size=chunk_size, n_jobs=n_jobs, clean=clean_resume)
+    return path
+
+
+def clean_corpus(texts, n_jobs=1):
+    n_jobs = resolve_n_jobs(n_jobs)
+    texts = list(texts)
+    if n_jobs == 1 or len(texts) < 1000:
+        return [clean_resume(t) for t in texts]
+    with Pool(n_jobs) as pool:
+        return pool.map(clean_resume, texts, chunksize=max(1, len(texts) // (n_jobs * 4)))
 
 # -------------------------------
-# 7. Evaluation
+# 4. Hyperparameter Search
 # -------------------------------
-y_pred = model.predict(X_test_vec)
-print("Accuracy:", accuracy_score(y_test, y_pred))
-print("\nClassification Report:\n", classification_report(y_test, y_pred))
+def search_hyperparameters(X_train, y_train, method="grid", n_iter=10, cv=3, n_jobs=1, use_cache=True):
+    """Cross-validated search over SEARCH_SPACE; returns ``(vectorizer_params, model_params, best_score)``."""
+    pipeline = Pipeline(
+        [("tfidf", TfidfVectorizer(**VECTORIZER_PARAMS)), ("clf", LogisticRegression(**MODEL_PARAMS))],
+        # Fitted vectorizers are reused across classifier settings within the search
+        memory=os.path.join(CACHE_DIR, "search") if use_cache else None,
+    )
+    if method == "grid":
+        search = GridSearchCV(pipeline, SEARCH_SPACE, cv=cv, n_jobs=n_jobs, scoring="accuracy")
+    else:
+        search = RandomizedSearchCV(
+            pipeline, SEARCH_SPACE, n_iter=n_iter, cv=cv, n_jobs=n_jobs, scoring="accuracy", random_state=42
+        )
+    search.fit(X_train, y_train)
+    vectorizer_params = dict(VECTORIZER_PARAMS)
+    model_params = dict(MODEL_PARAMS)
+    for name, value in search.best_params_.items():
+        step, param = name.split("__", 1)
+        (vectorizer_params if step == "tfidf" else model_params)[param] = value
+    return vectorizer_params, model_params, search.best_score_
 
 # -------------------------------
-# 8. Save Model & Vectorizer
+# 5. Training Pipeline
 # -------------------------------
-with open("src/model.pkl", "wb") as f:
-    pickle.dump(model, f)
+def train(data_path=DATA_PATH, n_jobs=1, search=None, n_iter=10, cv=3, use_cache=True, dedupe=None,
+          chunk_size=CHUNK_SIZE, dtype=BUNDLE_DTYPE):
+    timer = StageTimer()
+    n_jobs = resolve_n_jobs(n_jobs)
+
+    # Save role_skills for app.py
+    with open(ROLE_SKILLS_PATH, "wb") as f:
+        pickle.dump(role_skills, f)
+    print(f"✅ Role-Skills dictionary saved successfully in {ROLE_SKILLS_PATH}")
+
+    # Load and clean the dataset (expects 'Category' (target) and 'Resume' (text) columns) in chunks
+    with timer.stage("clean"):
+        data_key = data_sha256 = file_hash(data_path)
+        corpus = cleaned_corpus(data_path, params_hash(data_key, CACHE_VERSION), n_jobs, chunk_size, use_cache)
+        labels = read_column(corpus, "Category")
+    print("Resumes:", len(labels))
+    print("Categories:", pd.unique(labels))
+
+    rows = np.arange(len(labels))
+    # Near-duplicates would otherwise land on both sides of the split and inflate test accuracy
+    if dedupe:
+        with timer.stage("dedupe"):
+            duplicates = cached("duplicates", params_hash(data_key, CACHE_VERSION, dedupe),
+                                lambda: find_duplicates(iter_column(corpus, CLEANED_COLUMN), dedupe), use_cache)
+            rows = np.setdiff1d(rows, list(duplicates))
+            data_key = params_hash(data_key, dedupe)  # features are cached per deduplicated corpus
+        print(f"Dropped {len(duplicates)} near-duplicate resumes, {len(rows)} left")
+
+    # Train-Test Split on row positions; texts are streamed from the corpus when needed
+    train_rows, test_rows, y_train, y_test = split_rows(rows, labels)
+
+    vectorizer_params, model_params = VECTORIZER_PARAMS, MODEL_PARAMS
+    if search:
+        with timer.stage("search"):
+            # Cross-validation refits the vectorizer per fold, so the training texts are loaded here
+            cleaned = read_column(corpus, CLEANED_COLUMN)
+            vectorizer_params, model_params, best_score = search_hyperparameters(
+                list(cleaned[train_rows]), y_train, search, n_iter, cv, n_jobs, use_cache
+            )
+            del cleaned
+        print(f"Best CV accuracy {best_score:.4f} with {vectorizer_params} {model_params}")
+
+    # Vectorization on streams of the corpus: fit from term counts, then transform chunk by chunk.
+    # Streams come out in file order, so rows are put back in split order afterwards.
+    def vectorize():
+        train_texts = iter_column(corpus, CLEANED_COLUMN, train_rows, chunk_size)
+        vectorizer = fit_tfidf(train_texts, chunk_size, n_jobs, **vectorizer_params)
+        features = transform_column(corpus, vectorizer, CLEANED_COLUMN, chunk_size, n_jobs)
+        return vectorizer, features[train_rows], features[test_rows]
+
+    with timer.stage("vectorize"):
+        features_key = params_hash(data_key, CACHE_VERSION, vectorizer_params)
+        vectorizer, X_train_vec, X_test_vec = cached("features", features_key, vectorize, use_cache)
+
+    # Model Training
+    with timer.stage("fit"):
+        model = LogisticRegression(**model_params)
+        model.fit(X_train_vec, y_train)
+
+    # Evaluation
+    with timer.stage("evaluate"):
+        y_pred = model.predict(X_test_vec)
+    print("Accuracy:", accuracy_score(y_test, y_pred))
+    print("\nClassification Report:\n", classification_report(y_test, y_pred))
+
+    # Save Model & Vectorizer as one versioned bundle (the export read by predict.py and src/inference.py)
+    with timer.stage("save"):
+        training = {"data_sha256": data_sha256, "dedupe": dedupe, "test_size": TEST_SIZE, "split_seed": SPLIT_SEED}
+        manifest = save_bundle(model, vectorizer, BUNDLE_DIR, dtype=dtype, training=training)
+    print(f"✅ Model bundle {manifest['model_version']} saved successfully in {BUNDLE_DIR}")
+
+    print(timer.report())
+    return model, vectorizer, timer.stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the resume category classifier.")
+    parser.add_argument("--data", default=DATA_PATH, help="CSV with 'Category' and 'Resume' columns")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Processes for cleaning and search (-1: all CPUs)")
+    parser.add_argument("--search", choices=["grid", "random"], help="Run a hyperparameter search first")
+    parser.add_argument("--n-iter", type=int, default=10, help="Candidates tried by --search random")
+    parser.add_argument("--cv", type=int, default=3, help="Cross-validation folds for --search")
+    parser.add_argument("--no-cache", action="store_true", help=f"Recompute every stage instead of reusing {CACHE_DIR}")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows read and cleaned at a time")
+    parser.add_argument("--dedupe", type=float, nargs="?", const=THRESHOLD, metavar="THRESHOLD",
+                        help=f"Drop near-duplicate resumes first (MinHash Jaccard, default {THRESHOLD})")
+    parser.add_argument("--dtype", choices=["float32", "float64"], default=BUNDLE_DTYPE,
+                        help="Float type of the exported bundle arrays")
+    args = parser.parse_args(argv)
+    train(args.data, args.n_jobs, args.search, args.n_iter, args.cv, use_cache=not args.no_cache,
+          dedupe=args.dedupe, chunk_size=args.chunk_size, dtype=args.dtype)
 
-with open("src/vectorizer.pkl", "wb") as f:
-    pickle.dump(vectorizer, f)
 
-print("✅ Model and Vectorizer saved successfully in src/")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# save_bundle must never rewrite a file another process may have memory-mapped.
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+
+from bundle import load_bundle, save_bundle  # noqa: E402
+
+TEXTS = ["python pandas sql", "java spring sql", "html css javascript", "python django api",
+         "recruitment onboarding", "talent acquisition interviewing"]
+LABELS = ["Data", "Java", "Web", "Python", "HR", "HR"]
+
+
+def fit(C=1.0):
+    vectorizer = TfidfVectorizer().fit(TEXTS)
+    model = LogisticRegression(C=C, max_iter=1000).fit(vectorizer.transform(TEXTS), LABELS)
+    return model, vectorizer
+
+
+def test_rewrite_leaves_mapped_arrays_alone(tmp_path):
+    model, vectorizer = fit()
+    first = save_bundle(model, vectorizer, str(tmp_path))
+    mapped = load_bundle(str(tmp_path))
+    coef = np.array(mapped.coef)
+
+    # A different model, then a float32 re-export that shrinks every float file
+    second = save_bundle(*fit(C=10.0), str(tmp_path))
+    assert second["model_version"] != first["model_version"]
+    np.testing.assert_array_equal(mapped.coef, coef)
+    third = save_bundle(*fit(C=10.0), str(tmp_path), dtype=np.float32)
+    np.testing.assert_array_equal(mapped.coef, coef)
+
+    assert load_bundle(str(tmp_path)).version == third["model_version"]
+    files = set(os.listdir(tmp_path))
+    # The previous version is kept for readers of the old manifest, the one before it is removed
+    assert {e["file"] for e in second["files"].values()} <= files
+    assert not {e["file"] for e in first["files"].values()} & files
+    assert not [f for f in files if ".tmp" in f]
+
+
+def test_same_model_keeps_version(tmp_path):
+    model, vectorizer = fit()
+    first = save_bundle(model, vectorizer, str(tmp_path))
+    again = save_bundle(model, vectorizer, str(tmp_path))
+    assert again["model_version"] == first["model_version"]
+    assert load_bundle(str(tmp_path), verify=True).version == first["model_version"]
@@ -0,0 +1,67 @@
+# DuplicateIndex flags near-duplicate resumes, leaves distinct ones alone and keeps its store across reopens.
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from dedup import DuplicateIndex, find_duplicates  # noqa: E402
+
+WORDS = ("python java sql developer engineer manager project team data analysis cloud aws docker "
+         "kubernetes react design testing sales marketing finance hr recruitment onboarding payroll "
+         "led built improved reduced delivered customers reports pipelines models years experience").split()
+
+
+def resume(seed, n=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def edited(text, changes=2):
+    tokens = text.split()
+    for i in range(changes):
+        tokens[10 + 100 * i] = "kotlin"
+    return " ".join(tokens)
+
+
+def test_near_duplicate_is_flagged_and_distinct_is_not():
+    index = DuplicateIndex()
+    original = resume(0)
+    assert index.check("a", original) == (None, None)
+    duplicate_of, score = index.check("b", edited(original))
+    assert duplicate_of == "a" and score >= index.threshold
+    assert index.check("c", resume(1)) == (None, None)
+    assert len(index) == 3
+
+
+def test_rechecking_the_same_resume_repeats_the_first_answer():
+    index = DuplicateIndex()
+    original = resume(0)
+    index.check("a", original)
+    first = index.check("b", edited(original))
+    assert index.check("b", edited(original)) == first
+    assert index.check("a", original) == (None, None)  # not a duplicate of itself
+    # The same text under another id is an exact duplicate
+    assert index.check("a2", original) == ("a", 1.0)
+    assert len(index) == 2  # one row per distinct text
+
+
+def test_store_survives_reopen(tmp_path):
+    path = str(tmp_path / "signatures.sqlite")
+    index = DuplicateIndex(path)
+    index.check("batch1:0", resume(0))
+    index.close()
+
+    index = DuplicateIndex(path)
+    assert len(index) == 1
+    # Row ids repeat between inputs; the stored resume is still found
+    duplicate_of, _ = index.check("batch2:0", edited(resume(0)))
+    assert duplicate_of == "batch1:0"
+    assert index.check("batch2:1", resume(1)) == (None, None)
+    index.close()
+
+
+def test_find_duplicates():
+    texts = [resume(0), resume(1), edited(resume(0)), "", edited(resume(1), 1), ""]
+    assert find_duplicates(texts) == {2: 0, 4: 1}
@@ -0,0 +1,40 @@
+# ingest.fit_tfidf must select the same terms and idf as TfidfVectorizer.fit.
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from ingest import fit_tfidf  # noqa: E402
+
+WORDS = ("python java sql data analysis team project manager design testing cloud aws docker "
+         "kubernetes sales marketing client the and of with for").split()
+
+
+def corpus(n=400, seed=0):
+    rng = random.Random(seed)
+    # Zipf-like word choice so max_features has ties and a long tail to cut
+    weights = [1 / (i + 1) for i in range(len(WORDS))]
+    return [" ".join(rng.choices(WORDS, weights, k=rng.randint(0, 60))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("params", [
+    {"max_features": 5000, "stop_words": "english", "ngram_range": (1, 2)},
+    {"max_features": 40, "ngram_range": (1, 2)},
+    {"max_features": 15, "sublinear_tf": True},
+    {"min_df": 3, "max_df": 0.9},
+    {"smooth_idf": False, "ngram_range": (1, 3)},
+])
+def test_fit_tfidf_matches_sklearn(params):
+    texts = corpus()
+    expected = TfidfVectorizer(**params).fit(texts)
+    fitted = fit_tfidf(iter(texts), batch_size=64, **params)
+    assert fitted.vocabulary_ == expected.vocabulary_
+    np.testing.assert_allclose(fitted.idf_, expected.idf_, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(fitted.transform(texts).toarray(), expected.transform(texts).toarray(), atol=1e-12)
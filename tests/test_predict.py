@@ -0,0 +1,43 @@
+# The numpy backend (src/inference.py) must agree with scikit-learn on the checked-in bundle.
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from predict import predict_batch  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOLERANCE = 1e-4  # as in inference.validate
+
+RESUMES = [
+    "Experienced Python developer: pandas, NumPy, scikit-learn, SQL and Django REST APIs. https://github.com/me",
+    "Java Spring Boot engineer with Hibernate, Maven, microservices and Kubernetes (k8s).",
+    "HR generalist: recruitment, onboarding, payroll and employee relations.",
+    "Front-end developer, HTML/CSS, JavaScript, React.js and Node.js",
+    "Civil engineer, AutoCAD and site supervision",
+    "",
+]
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    # predict.py reads the bundle through a path relative to the repository root
+    monkeypatch.chdir(ROOT)
+
+
+def test_numpy_backend_matches_sklearn():
+    labels, proba = predict_batch(RESUMES, top_k=3, backend="sklearn")
+    fast_labels, fast_proba = predict_batch(RESUMES, top_k=3, backend="numpy")
+    assert proba.shape == fast_proba.shape == (len(RESUMES), 3)
+    np.testing.assert_allclose(fast_proba, proba, atol=TOLERANCE)
+    assert list(fast_labels[:, 0]) == list(labels[:, 0])
+
+
+def test_numpy_backend_matches_sklearn_across_batches():
+    labels, proba = predict_batch(RESUMES, top_k=1, batch_size=2, backend="sklearn")
+    fast_labels, fast_proba = predict_batch(RESUMES, top_k=1, batch_size=2, backend="numpy")
+    np.testing.assert_allclose(fast_proba, proba, atol=TOLERANCE)
+    assert list(fast_labels[:, 0]) == list(labels[:, 0])
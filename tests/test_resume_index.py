@@ -0,0 +1,44 @@
+# ResumeIndex.add replaces ids, repeated ones included, and merges small segments without touching full ones.
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from resume_index import MAX_SMALL_SEGMENTS, ResumeIndex  # noqa: E402
+from skill_matcher import SkillMatcher  # noqa: E402
+
+TEXTS = ["python django sql", "java spring hibernate", "react javascript css", "recruitment onboarding payroll"]
+
+
+def make_index(segment_size=4):
+    vectorizer = TfidfVectorizer().fit(TEXTS)
+    matcher = SkillMatcher({"Dev": ["Python", "Java", "React"]}, fuzzy=False)
+    return ResumeIndex(vectorizer, matcher, segment_size=segment_size)
+
+
+def test_repeated_id_in_one_add_keeps_the_last_text():
+    index = make_index()
+    index.add(["a", "b", "a"], ["python django sql", "java spring", "recruitment payroll"])
+    assert len(index) == 2
+    assert sorted(index.ids[row] for row in index._rows.values()) == ["a", "b"]
+    assert int((~index.deleted).sum()) == 2
+    hits = index.search("python django sql", k=10)
+    assert [h["id"] for h in hits if h["cosine"] > 0] == []
+    assert index.search("recruitment payroll", k=1)[0]["id"] == "a"
+
+
+def test_small_segments_are_merged_and_full_ones_kept():
+    index = make_index(segment_size=4)
+    index.add([f"full{i}" for i in range(4)], TEXTS)
+    full = index.segments[0]
+    for i in range(MAX_SMALL_SEGMENTS + 1):
+        index.add([f"r{i}"], [TEXTS[i % len(TEXTS)]])
+    assert index.segments[0] is full
+    assert all(s[0].shape[0] <= 4 for s in index.segments)
+    assert len(index.segments) <= 1 + MAX_SMALL_SEGMENTS
+    assert sum(s[0].shape[0] for s in index.segments) == len(index.ids) == 4 + MAX_SMALL_SEGMENTS + 1
+    assert index.search("java spring hibernate", k=1)[0]["id"] in {"full1", "r1", "r5", "r9", "r13"}
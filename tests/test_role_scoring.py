@@ -0,0 +1,59 @@
+# RoleScorer must rank roles like the original dictionary-based predict_role.
+
+import os
+import pickle
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from role_scoring import RoleScorer  # noqa: E402
+
+ROLE_SKILLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "role_skills.pkl")
+
+
+def old_predict_role(role_skills, skills_found):
+    role_match_count = {}
+    for role, skills in role_skills.items():
+        role_match_count[role] = len(set(skills_found) & set(skills))
+    sorted_roles = sorted(role_match_count.items(), key=lambda x: x[1], reverse=True)
+    best_role = sorted_roles[0][0]
+    secondary_roles = [role for role, count in sorted_roles[1:3]]
+    best_role_skills_to_master = list(set(role_skills[best_role]) - set(skills_found))
+    secondary_roles_suggestions = {role: list(set(role_skills[role]) - set(skills_found)) for role in secondary_roles}
+    return best_role, best_role_skills_to_master, secondary_roles_suggestions
+
+
+@pytest.fixture(scope="module")
+def role_skills():
+    with open(ROLE_SKILLS_PATH, "rb") as f:
+        return pickle.load(f)
+
+
+def skill_sets(role_skills, n=2000, seed=0):
+    rng = random.Random(seed)
+    skills = sorted({s for skill_list in role_skills.values() for s in skill_list})
+    yield []
+    for _ in range(n):
+        yield rng.sample(skills, rng.randint(1, 12))
+
+
+def test_predict_role_matches_old_implementation(role_skills):
+    scorer = RoleScorer(role_skills)
+    for skills_found in skill_sets(role_skills):
+        best, missing, secondary = scorer.predict_role(skills_found)
+        old_best, old_missing, old_secondary = old_predict_role(role_skills, skills_found)
+        assert best == old_best
+        assert sorted(missing) == sorted(old_missing)
+        assert list(secondary) == list(old_secondary)
+        assert {r: sorted(m) for r, m in secondary.items()} == {r: sorted(m) for r, m in old_secondary.items()}
+
+
+def test_score_many_matches_score(role_skills):
+    scorer = RoleScorer(role_skills)
+    skill_lists = list(skill_sets(role_skills, n=200, seed=1))
+    counts = scorer.score_many(skill_lists)
+    for row, skills_found in zip(counts, skill_lists):
+        assert row.tolist() == scorer.score(skills_found)[0].tolist()
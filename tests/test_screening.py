@@ -0,0 +1,42 @@
+# screening.clean_text must stay identical to the original four-substitution
+# implementation: the bundle's vocabulary was fitted on its output.
+
+import random
+import re
+
+from screening import clean_text
+
+FRAGMENTS = [
+    "python", "Data", "SCIENCE", "user@example.com", "http://x.io/a?b=1", "https", "httpx", "www.site.org",
+    "C++", "node.js", "e-mail", "2019-2021", "résumé", "naïve", " ", "\t", "\n", "\r\n", "\xa0", "\u2003",
+    ".", ",", "(", "/", "#", "ß", "İ", "K", "ﬁnance", "Ⅻ",
+]
+
+
+def old_clean_text(text):
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[^a-zA-Z ]", " ", text)
+    text = text.lower()
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def fuzzed(n, seed=0):
+    rng = random.Random(seed)
+    chars = "aZ h:/ttp.\n\t-_é1İ\xa0"
+    for _ in range(n):
+        if rng.random() < 0.5:
+            parts = rng.choices(FRAGMENTS, k=rng.randint(0, 12))
+            yield "".join(p + rng.choice(["", " ", ".", "\n"]) for p in parts)
+        else:
+            yield "".join(rng.choices(chars, k=rng.randint(0, 30)))
+
+
+def test_clean_text_matches_old_implementation():
+    for text in fuzzed(50_000):
+        assert clean_text(text) == old_clean_text(text), repr(text)
+
+
+def test_clean_text():
+    assert clean_text("Python, SQL & AWS — see https://example.com/cv!") == "python sql aws see"
+    assert clean_text("") == ""
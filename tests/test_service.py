@@ -0,0 +1,40 @@
+# MicroBatcher must resolve every submitted future, even when batch_fn misbehaves.
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("tornado")
+pytest.importorskip("sklearn")
+
+from service import MicroBatcher  # noqa: E402
+
+
+def run_batch(batch_fn, items):
+    async def main():
+        batcher = MicroBatcher(batch_fn, max_batch_size=len(items), max_wait_ms=50)
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(item) for item in items), return_exceptions=True), timeout=5
+            )
+        finally:
+            batcher.close()
+
+    return asyncio.run(main())
+
+
+def test_results_in_order():
+    assert run_batch(lambda items: [item * 2 for item in items], [1, 2, 3]) == [2, 4, 6]
+
+
+def test_short_result_list_fails_every_item():
+    results = run_batch(lambda items: items[:-1], [1, 2, 3])
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_exception_fails_every_item():
+    def fail(items):
+        raise ValueError("boom")
+
+    results = run_batch(fail, [1, 2])
+    assert all(isinstance(r, ValueError) for r in results)
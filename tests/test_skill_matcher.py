@@ -0,0 +1,107 @@
+# SkillMatcher matches whole tokens and multi-word skills in one pass over the text,
+# and maps aliases and typos of skill words onto the skill without false corrections.
+
+from skill_matcher import ALIASES, FuzzyIndex, SkillMatcher, edit_distance, normalize_skill, tokenize
+
+ROLE_SKILLS = {
+    "Java Developer": ["Java", "Spring", "Hibernate", "SQL"],
+    "Web Developer": ["JavaScript", "React", "Node.js", "HTML", "CSS"],
+    "Data Scientist": ["Python", "Machine Learning", "Deep Learning", "scikit-learn", "SQL"],
+    "DevOps Engineer": ["Kubernetes", "CI/CD", "Docker"],
+}
+
+
+def matcher(**kwargs):
+    return SkillMatcher(ROLE_SKILLS, fuzzy=False, **kwargs)
+
+
+def test_tokenize():
+    assert tokenize("Node.js, CI/CD & C++") == ["node", "js", "ci", "cd", "c"]
+    assert normalize_skill("scikit-learn") == ("scikit", "learn")
+
+
+def test_java_does_not_match_inside_javascript():
+    assert matcher().match("javascript developer")[0] == ["javascript"]
+    assert matcher().match("java developer")[0] == ["java"]
+    assert matcher().match("Java and JavaScript")[0] == ["java", "javascript"]
+    assert matcher().match("javas scripting")[0] == []
+
+
+def test_multi_word_skills():
+    skills, _ = matcher().match("Machine-learning and deep   learning with scikit learn; CI/CD pipelines")
+    assert skills == ["machine learning", "deep learning", "scikit-learn", "ci/cd"]
+    # Only the full phrase counts
+    assert matcher().match("machine operator, learning fast")[0] == []
+    assert matcher().match("deep machine learning")[0] == ["machine learning"]
+
+
+def test_matches_are_in_first_occurrence_order_without_repeats():
+    assert matcher().match("SQL, Python, sql, python, Docker")[0] == ["sql", "python", "docker"]
+
+
+def test_role_ids():
+    m = matcher()
+    skills, role_ids = m.match("sql")
+    assert skills == ["sql"]
+    assert [m.roles[i] for i in role_ids] == ["Java Developer", "Data Scientist"]
+    assert m.match("nothing relevant here") == ([], [])
+
+# -------------------------------
+# Aliases and typo tolerance
+# -------------------------------
+FUZZY_SKILLS = {
+    "Web Developer": ["React", "HTML", "NodeJS", "Spring"],
+    "Data Scientist": ["Python", "scikit-learn", "PostgreSQL", "TensorFlow"],
+    "DevOps Engineer": ["Kubernetes", "Docker", "Jenkins"],
+}
+
+
+def fuzzy_matcher(known_words=()):
+    return SkillMatcher(FUZZY_SKILLS, aliases=ALIASES, known_words=known_words)
+
+
+def test_aliases():
+    m = fuzzy_matcher()
+    assert m.match("k8s, postgres and sklearn")[0] == ["kubernetes", "postgresql", "scikit-learn"]
+    assert m.match("Node.js")[0] == m.match("node js")[0] == m.match("Node-JS")[0] == ["nodejs"]
+    assert m.match("ReactJS, Spring Boot")[0] == ["react", "spring"]
+    # An alias of a skill missing from the dictionary is ignored
+    assert not m.add_alias("gke", "google kubernetes engine")
+    assert m.match("gke")[0] == []
+
+
+def test_typos_are_corrected():
+    m = fuzzy_matcher()
+    for typo, skill in [("sckit-learn", "scikit-learn"), ("pyhton", "python"), ("dokcer", "docker"),
+                        ("dockr", "docker"), ("jenkin", "jenkins"), ("tensrflow", "tensorflow"),
+                        ("kuberentes", "kubernetes"), ("kbernetis", "kubernetes")]:
+        assert m.match(typo)[0] == [skill], typo
+
+
+def test_near_misses_are_not_corrected():
+    m = fuzzy_matcher()
+    # One substituted letter below FUZZY_LONG_LENGTH is another real word, not a typo
+    assert m.match("sprint planning")[0] == []
+    assert m.match("pythin")[0] == []
+    # Too short to correct, or too far away
+    assert m.match("htlm reac")[0] == []
+    assert m.match("kbrnetis")[0] == []
+    # Words known to be spelled correctly are left alone
+    assert fuzzy_matcher(known_words={"dokcer"}).match("dokcer")[0] == []
+    assert SkillMatcher(FUZZY_SKILLS, fuzzy=False).match("pyhton")[0] == []
+
+
+def test_fuzzy_lookup_ties_and_limits():
+    index = FuzzyIndex()
+    for word in ("spring", "sprint"):
+        index.add(word)
+    assert index.lookup("sprinz", 1) is None  # tie
+    assert index.lookup("sprng", 1) == "spring"
+    assert index.lookup("spr", 2) is None
+
+
+def test_edit_distance():
+    assert edit_distance("kitten", "sitting", 5) == 3
+    assert edit_distance("pyhton", "python", 2) == 1  # adjacent swap
+    assert edit_distance("abcd", "wxyz", 2) == 3  # capped at limit + 1
+    assert edit_distance("abc", "abcdef", 2) == 3